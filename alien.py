@@ -1,34 +0,0 @@
-import pygame
-from pygame.sprite import Sprite
-
-
-class Alien(Sprite):
-    """A class to represent a single alien in the fleet."""
-
-    def __init__(self, ai_game):
-        """Initialize the alien and set it's starting position"""
-        super().__init__()
-        self.screen = ai_game.screen
-        self.settings = ai_game.settings
-
-        # Load the alien image and set it's rect attribute
-        self.image = pygame.image.load(self.settings.alien_image)
-        self.rect = self.image.get_rect()
-
-        # Start each new alien near the top of the screen
-        self.rect.x = self.rect.width
-        self.rect.y = self.rect.height
-
-        # Store the alien's exact horizontal position
-        self.x = float(self.rect.x)
-
-    def check_edges(self):
-        """Return True if alien is at edge of screen"""
-        screen_rect = self.screen.get_rect()
-        if self.rect.right >= screen_rect.right or self.rect.left <= 0:
-            return True
-
-    def update(self, dt):
-        """Move the alien to the right"""
-        self.x += (self.settings.alien_speed * self.settings.fleet_direction) * dt
-        self.rect.x = self.x
@@ -1,336 +1,312 @@
+import atexit
+import random
 import sys
-from random import randint
-from time import sleep
+from datetime import datetime
 
 import pygame
 
-from alien import Alien
-from bullet import Bullet, SuperBullet
+import game_state
+import simulation
+from assets import AssetCache
+from background import Background
 from button import Button
-from game_stats import GameStats
+from controls import Controls, QUIT
+from game_state import GameState
+from pacing import FramePacer
+from particles import ParticleSystem
+from profiler import FrameProfiler, NullProfiler, ProfilerOverlay
+from renderer import DirtyRenderer, RenderBatch, entity_items, hud_items
+from replay import Recorder
 from scoreboard import Scoreboard
 from settings import Settings
-from ship import Ship
+from simulation import Simulation
+from sound import SoundEngine
 from star import Star
+from store import HIGH_SCORE_LOADED, ScoreStore
+from viewport import Viewport
 
 
 class AlienInvasion:
-    """Overall class to manage game assets and behavior"""
+    """Overall class to draw the game and feed it player input"""
 
-    def __init__(self):
+    def __init__(self, settings=None):
         """Initializes the game, and create game resources"""
-        pygame.init()
-        self.settings = Settings()
+        # Only start the parts of pygame the game uses. The mixer is started
+        # on the asset loading thread, since opening audio can be slow.
+        pygame.display.init()
+        pygame.font.init()
+        self.settings = settings or Settings()
         # ------------ Time Settings ------------
         self.TARGET_FPS = 60
-        self.clock = pygame.time.Clock()
-        # Determine and set screen settings
+        self.pacer = FramePacer(self)
+        # How far between the last two simulation steps sprites are drawn
+        self.alpha = 1.0
+        # Open the display. Full screen uses the display's own resolution;
+        # the game keeps playing on the same logical playfield either way.
         if self.settings.full_screen:
             self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-            self.settings.screen_width = self.screen.get_rect().width
-            self.settings.screen_height = self.screen.get_rect().height
-            self.settings.ship_speed_x = 2
         else:
-            self.screen = pygame.display.set_mode(
-                (self.settings.screen_width, self.settings.screen_height)
-            )
+            self.screen = self._set_windowed_mode()
         pygame.display.set_caption("Alien Invasion")
+        # Every random number comes from here, so a seed replays a session
+        self.seed = self.settings.seed
+        if self.seed is None:
+            self.seed = random.randrange(2 ** 63)
+        self.rng = random.Random(self.seed)
+        # Decode every sprite image once, now that the display format is known
+        self.assets = AssetCache(self)
+        self.assets.preload()
+        # Where the playfield goes on the display, and its sprites at that scale
+        self.viewport = Viewport(self)
+        # Everything else loads behind the loading screen
+        self._load_in_background()
+        # Time each part of the frame, if asked to
+        if self.settings.profile:
+            self.profiler = FrameProfiler(self.settings.profile_window)
+            if self.settings.profile_output:
+                atexit.register(self.profiler.dump, self.settings.profile_output)
+        else:
+            self.profiler = NullProfiler()
+        # The game's rules run in the simulation; this class only draws it.
+        # A scaled display gets the simulation its own logical-size screen.
+        playfield = None if self.viewport.scaled else self.screen
+        self.sim = Simulation(self.settings, playfield, self.assets, self.profiler)
+        self.stats = self.sim.stats
+        # Loading, menu, playing, and the timed pauses in between
+        self.state = GameState(self, game_state.LOADING)
+        # Turns the keyboard into each step's actions
+        self.controls = Controls(self)
+        # Record the session, if asked to
+        if self.settings.record_path:
+            self.recorder = Recorder(self.settings.record_path, self.seed, self.settings)
+            atexit.register(self.recorder.close, self.sim)
+        else:
+            self.recorder = None
+        # Keep the high score and a record of each game, if asked to. The
+        # saved high score arrives later as a HIGH_SCORE_LOADED event.
+        if self.settings.save_path:
+            self.store = ScoreStore(self.settings.save_path)
+            atexit.register(self._close_store)
+        else:
+            self.store = None
+        # When the game in progress started, and how long each frame took
+        self.game_started = None
+        self.frame_times = []
+
         # Initialize our game objects
-        self.stats = GameStats(self)
         self.sb = Scoreboard(self)
         self.stars = pygame.sprite.Group()
+        self.background = Background(self)
         self._gen_starfield()
-        self.ship = Ship(self)
-        self.bullets = pygame.sprite.Group()
-        self.super_bullets = pygame.sprite.Group()
-        self.aliens = pygame.sprite.Group()
-        # Load in our settings
-
 
-        self._create_fleet()
+        # Sound effects, which start once the mixer has loaded
+        self.sounds = SoundEngine(self)
+        # Explosions, drawn over the ship, projectiles and fleet
+        self.particles = ParticleSystem(self)
 
-        # Make a play button
+        # Make a play button, and the text shown while loading
         self.play_button = Button(self, "Play")
+        self.loading_image = self.sb.font.render("Loading...", True, self.sb.text_color)
+        if self.settings.profile:
+            self.overlay = ProfilerOverlay(self, self.profiler)
+        else:
+            self.overlay = None
 
-        # --------------- Background image settings ---------------- #
-        # self.bg_color = self.settings.bg_color
-        # self.bg_image = pygame.image.load(self.settings.bg_image)
-        # self.bg_image = pygame.transform.scale(
-        #     self.bg_image,
-        #     (
-        #         self.settings.screen_width,
-        #         self.settings.screen_height
-        #     )
-        # )
+        # Everything drawn over the background, one blits() call per layer
+        self.batch = RenderBatch(('entities', 'particles', 'hud'))
+        # Only redraw what changed, if asked to
+        if self.settings.render_mode == 'dirty':
+            self.renderer = DirtyRenderer(self)
+        else:
+            self.renderer = None
+
+    def _set_windowed_mode(self):
+        """Open the window, synced to the display's refresh if asked to"""
+        size = self.settings.window_size or (
+            self.settings.screen_width, self.settings.screen_height
+        )
+        if self.settings.vsync:
+            try:
+                # VSync needs a renderer SDL can sync, which SCALED provides
+                return pygame.display.set_mode(size, pygame.SCALED, vsync=1)
+            except pygame.error:
+                # Not every video driver can sync; use the frame rate cap
+                self.settings.vsync = False
+        return pygame.display.set_mode(size)
+
+    def _load_in_background(self):
+        """Start loading the sounds and the images the menu doesn't need yet"""
+        images = [path for path, _ in self.settings.parallax_layers]
+        if self.settings.show_bg_image:
+            images.append(self.settings.bg_image)
+        self.assets.load_in_background(images, self.settings.sound_dir)
+
+    def _finish_loading(self):
+        """Take in the background loads and go to the menu"""
+        self.assets.finish_loading()
+        self.viewport.prescale()
+        self.sounds.start()
+        self.state.enter(game_state.MENU)
 
     def run_game(self):
         """Start the main loop for the game"""
         while True:
+            self._run_frame()
 
-            # Watch for keyboard and mouse events
+    def _run_frame(self):
+        """Handle input, advance the game and draw one frame"""
+        # Watch for keyboard and mouse events
+        with self.profiler.section('events'):
             self._check_events()
-            if self.stats.game_active:
-                self.dt = self.clock.tick(60) * .001 * self.TARGET_FPS
-                # Update the ship
-                self.ship.update(self.dt)
-                # Update the bullets
-                self._update_bullets(self.dt)
-                self._update_super_bullets(self.dt)
-                # Update the aliens
-                self._update_aliens(self.dt)
-            # Redraw the screen during each pass through the loop
+        # Tick every frame, so time spent in the menu isn't one long frame.
+        # The menu has nothing moving, so it runs at a lower frame rate.
+        self.dt = self.pacer.tick(idle=self.state.state == game_state.MENU)
+        if self.state.state == game_state.LOADING and not self.assets.loading:
+            self._finish_loading()
+        if self.stats.game_active:
+            self.background.update(self.dt)
+        # Explosions play out on the frame clock, through pauses as well
+        with self.profiler.section('particles'):
+            self.particles.update(self.dt)
+        if self.state.playing:
+            self.frame_times.append(self.pacer.clock.get_time())
+            for dt in self.pacer.steps(self.dt):
+                self._step(dt)
+                # A hit or a cleared fleet pauses the game mid frame
+                if not self.state.playing:
+                    self.pacer.reset()
+                    break
+            self.alpha = self.pacer.alpha
+        else:
+            self.alpha = 1.0
+            # Pauses run down on the frame clock while the window keeps drawing
+            self.state.update(self.dt)
+            # Presses made during a pause shouldn't all fire once it ends
+            self.controls.clear()
+        # Redraw the screen during each pass through the loop
+        with self.profiler.section('screen'):
             self._update_screen()
 
     def _check_events(self):
-        """Respond to keypresses and mouse events"""
+        """Respond to keypresses and mouse events, then poll the held keys"""
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 sys.exit()
             elif event.type == pygame.KEYDOWN:
-                self._check_keydown_events(event)
-            elif event.type == pygame.KEYUP:
-                self._check_keyup_events(event)
+                if self.controls.key_down(event.key) == QUIT:
+                    sys.exit()
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
-                self._check_play_button(mouse_pos)
+                self._check_play_button(self.viewport.to_logical(event.pos))
+            elif event.type == HIGH_SCORE_LOADED:
+                self._load_high_score(event.score)
+        self.controls.poll()
 
     def _check_play_button(self, mouse_pos):
         """Start a new game when the player clicks Play"""
         button_clicked = self.play_button.rect.collidepoint(mouse_pos)
-        if button_clicked and not self.stats.game_active:
-            # Reset game settings
-            self.settings.initialize_dynamic_settings()
-            # Reset the game stats
-            self.stats.reset_stats()
-            self.stats.game_active = True
-            self.sb.prep_score()
-            self.sb.prep_level()
-
-            self._reset_entities()
-            # Hide the mouse cursor.
-            pygame.mouse.set_visible(False)
-
-    def _check_keydown_events(self, event):
-        """Respond to key presses"""
-        if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-            # Move the ship to the right
-            self.ship.moving_right = True
-        if event.key == pygame.K_LEFT or event.key == pygame.K_a:
-            self.ship.moving_left = True
-        if event.key == pygame.K_UP or event.key == pygame.K_w:
-            self.ship.moving_up = True
-        if event.key == pygame.K_DOWN or event.key == pygame.K_s:
-            self.ship.moving_down = True
-        if event.key == pygame.K_SPACE:
-            self._fire_bullet()
-        if event.key == pygame.K_KP0:
-            self._fire_super_bullet()
-        if event.key == pygame.K_q:
-            sys.exit()
-
-    def _check_keyup_events(self, event):
-        if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-            self.ship.moving_right = False
-        if event.key == pygame.K_LEFT or event.key == pygame.K_a:
-            self.ship.moving_left = False
-        if event.key == pygame.K_UP or event.key == pygame.K_w:
-            self.ship.moving_up = False
-        if event.key == pygame.K_DOWN or event.key == pygame.K_s:
-            self.ship.moving_down = False
-
-    def _fire_bullet(self):
-        """Create a new bullet and add it to the bullets group."""
-        if len(self.bullets) < self.settings.bullet_inventory:
-            new_bullet = Bullet(self)
-            self.bullets.add(new_bullet)
+        if button_clicked and self.state.state == game_state.MENU:
+            # Start through the action stream so recordings capture it
+            self.controls.trigger(simulation.PLAY)
+            self._step(0.0)
+
+    def _step(self, dt):
+        """Advance the simulation with the player's actions"""
+        actions = self.controls.actions(dt)
+        if self.recorder:
+            self.recorder.record(actions, dt)
+        self.sim.step(actions, dt)
+        self._handle_sim_events()
+
+    def _handle_sim_events(self):
+        """Bring the HUD, window and sound up to date with the simulation"""
+        self.sounds.play_events(self.sim.events)
+        for effect, centers in self.sim.explosions:
+            self.particles.emit(effect, centers)
+        self.sim.explosions.clear()
+        for event in self.sim.events:
+            if event == simulation.GAME_STARTED:
+                self.state.enter(game_state.PLAYING)
+                self.game_started = datetime.now()
+                self.frame_times = []
+                # Hide the mouse cursor.
+                pygame.mouse.set_visible(False)
+            elif event == simulation.SCORE_CHANGED:
+                self.sb.prep_score()
+            elif event == simulation.HIGH_SCORE_CHANGED:
+                self.sb.prep_high_score()
+            elif event == simulation.LEVEL_CHANGED:
+                self.sb.prep_level()
+                # A new game starts on level 1 without a pause
+                if self.stats.level > 1:
+                    self.state.level_cleared()
+            elif event == simulation.SHIP_HIT:
+                self.state.ship_hit()
+            elif event == simulation.GAME_OVER:
+                self.state.game_over()
+                self._save_session()
+                pygame.mouse.set_visible(True)
+        self.sim.events.clear()
+
+    def _load_high_score(self, score):
+        """Show the saved high score, unless this session already beat it"""
+        if score > self.stats.high_score:
+            self.stats.high_score = score
+            self.sb.prep_high_score()
+
+    def _save_session(self):
+        """Hand the game that just ended to the store to save"""
+        if self.store and self.game_started:
+            self.store.save_session(self.game_started, self.stats, self.frame_times)
+        self.game_started = None
+
+    def _close_store(self):
+        """Save a game still in progress, then wait for the writes to finish"""
+        if self.stats.game_active:
+            self._save_session()
+        self.store.close()
 
     def _update_screen(self):
         """Update images on the screen and flip to new screen"""
-        self.screen.fill(self.settings.bg_color)
-        self.stars.draw(self.screen)
-        # self.screen.blit(self.bg_image, (0, 0))
-        self.ship.blitme()
-        for bullet in self.bullets.sprites():
-            bullet.blitme()
-        for super_bullet in self.super_bullets.sprites():
-            super_bullet.blitme()
-
-        self.aliens.draw(self.screen)
-
-        # Draw the score information
-        self.sb.show_score()
-
-        # Draw play button if game is inactive
-        if not self.stats.game_active:
-            self.play_button.draw_button()
+        if self.state.state == game_state.LOADING:
+            self._draw_loading_screen()
+            return
+        if self.overlay:
+            self.overlay.update()
+        if self.renderer:
+            self.renderer.draw()
+            return
+
+        self.background.draw(self.screen)
+
+        # Queue the ship, the projectiles and the fleet, then the explosions
+        viewport = self.viewport
+        self.batch.add('entities', viewport.items(entity_items(self.sim, self.alpha)))
+        self.batch.add('particles', viewport.items(self.particles.blit_items()))
+
+        # Queue the score information, and the play button if game is inactive.
+        # Text redrawn in place needs scaling again.
+        viewport.forget(self.sb.changed_images)
+        self.sb.changed_images.clear()
+        self.batch.add('hud', viewport.items(hud_items(self)))
+        self.batch.draw(self.screen)
 
         # Make the most recently drawn screen visible
         pygame.display.flip()
 
-    def _update_bullets(self, dt):
-        self.bullets.update(dt)
-        for bullet in self.bullets.copy():
-            if bullet.rect.bottom <= 0:
-                self.bullets.remove(bullet)
-
-        self._check_bullet_alien_collisions();
-
-    def _check_bullet_alien_collisions(self):
-        # Check for any bullets that have hit aliens
-        # if so, get rid of the bullet and the alien
-        bullet_collisions = pygame.sprite.groupcollide(
-            self.bullets, self.aliens, True, True
-        )
-        if bullet_collisions:
-            for aliens in bullet_collisions.values():
-                self.stats.score += self.settings.alien_points * len(aliens)
-            self.sb.prep_score()
-            self.sb.check_high_score()
-
-        if not self.aliens:
-            self._reset_entities()
-            self.settings.increase_speed()
-
-            # Increase level
-            self.stats.level += 1
-            self.sb.prep_level()
-
-    def _update_super_bullets(self, dt):
-        self.super_bullets.update(dt)
-        for super_bullet in self.super_bullets.copy():
-            if super_bullet.rect.bottom <= 0:
-                self.super_bullets.remove(super_bullet)
-
-        self._check_super_bullet_alien_collisions()
-
-    def _check_super_bullet_alien_collisions(self):
-        collisions = pygame.sprite.groupcollide(
-            self.super_bullets, self.aliens, True, True
-        )
-        if collisions:
-            for aliens in collisions.values():
-                self.stats.score += self.settings.alien_points * len(aliens)
-            self.sb.prep_score()
-            self.sb.check_high_score()
-
-        if not self.aliens:
-            self._reset_entities()
-            self.settings.increase_speed()
-
-            # Increase level
-            self.stats.level += 1
-            self.sb.prep_level()
-
-    def _create_fleet(self):
-        """Create the fleet of aliens."""
-        # Create an alien and find the number of aliens in a row.
-        # Spacing between each alien is equal to one alien width
-        alien = Alien(self)
-        alien_width, alien_height = alien.rect.size
-        available_space_x = self.settings.screen_width - (2 * alien_width)
-        number_aliens_x = available_space_x // (2 * alien_width)
-
-        # Determine the number of rows of aliens that can fit on the screen
-        ship_height = self.ship.rect.height
-        available_space_y = (self.settings.screen_height - (3 * alien_height) - ship_height)
-        number_rows = available_space_y // (2 * alien_height)
-
-        # Create the full fleet of aliens
-        for row_number in range(number_rows):
-            for alien_number in range(number_aliens_x):
-                self._create_alien(alien_number, row_number)
-
-    def _create_alien(self, alien_number, row_number):
-        alien = Alien(self)
-        alien_width, alien_height = alien.rect.size
-        alien.x = alien_width + 2 * alien_width * alien_number
-        alien.rect.x = alien.x
-        alien.rect.y = alien.rect.height + 2 * alien.rect.height * row_number
-        self.aliens.add(alien)
-
-    def _check_fleet_edges(self):
-        """Respond appropriately if any aliens have reached an edge."""
-        for alien in self.aliens.sprites():
-            if alien.check_edges():
-                self._change_fleet_direction()
-                break
-
-    def _change_fleet_direction(self):
-        """Drop the entire fleet and change the fleet's direction."""
-        for alien in self.aliens.sprites():
-            alien.rect.y += self.settings.fleet_drop_speed
-
-        self.settings.fleet_direction *= -1
+    def _draw_loading_screen(self):
+        """Show the loading text in the middle of a plain screen"""
+        self.screen.fill(self.settings.bg_color)
+        rect = self.loading_image.get_rect(center=self.viewport.rect.center)
+        self.screen.blits(self.viewport.items([(self.loading_image, rect)]), doreturn=False)
+        pygame.display.flip()
 
     def _gen_starfield(self):
         """Generates a starfield on the background."""
         # Create a random number of stars and add them to self.stars group
-        for num in range(20, randint(30, 40)):
+        for num in range(20, self.rng.randint(30, 40)):
             star = Star(self)
             self.stars.add(star)
-
-    def _update_aliens(self, dt):
-        """
-        Check if the fleet is at an edge,
-            then update the positions of all aliens in the fleet
-        :return: None
-        """
-        self._check_fleet_edges()
-        self.aliens.update(dt)
-
-        # Look for alien - player ship collisions
-        if pygame.sprite.spritecollideany(self.ship, self.aliens):
-            self._ship_hit()
-
-        # Look for aliens hitting the bottom of the screen
-        self._check_aliens_bottom()
-
-    def _check_aliens_bottom(self):
-        """Check to see if any aliens have reached the bottom of the screen"""
-        screen_rect = self.screen.get_rect()
-        for alien in self.aliens.sprites():
-            if alien.rect.bottom >= screen_rect.bottom:
-                # Treat this the same as the alien hitting the player ship
-                self._ship_hit()
-                break
-
-    def _ship_hit(self):
-        """Respond to the ship being hit by an alien"""
-        if self.stats.ships_left > 0:
-            # Decrement ships_left
-            self.stats.ships_left -= 1
-
-            self._reset_entities()
-            # Pause
-            sleep(0.5)
-        else:
-            self.stats.game_active = False
-            pygame.mouse.set_visible(True)
-
-    def _fire_super_bullet(self):
-        """Create a new bullet and add it to the bullets group."""
-        if len(self.super_bullets) < self.settings.super_bullet_inventory:
-            new_super_bullet = SuperBullet(self)
-            self.super_bullets.add(new_super_bullet)
-
-    def _reset_entities(self):
-        # Get rid of any remaining aliens and bullets
-        self.aliens.empty()
-        self.bullets.empty()
-        self.super_bullets.empty()
-        if self.settings.DEBUG:
-            print(f"""
-============================ DEBUG: Entity Speeds ============================
-                       Ship X Speed : {self.settings.ship_speed_x}
-                       Ship Y Speed : {self.settings.ship_speed_y}
-                       Bullet Speed : {self.settings.bullet_speed}
-                 Super Bullet Speed : {self.settings.super_bullet_speed}
-                        Alien Speed : {self.settings.alien_speed}
-                    """)
-
-        # Create a new fleet and center the ship
-        self._create_fleet()
-        self.ship.center_ship()
+        self.background.invalidate()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,136 @@
+import os
+import threading
+
+import pygame
+
+from atlas import SpriteAtlas
+
+
+def display_format(image):
+    """Return image converted to the display's pixel format, if there is one"""
+    # convert_alpha() needs a display mode, which headless tools may skip
+    if pygame.display.get_surface() is not None:
+        return image.convert_alpha()
+    return image
+
+
+def load_image(path):
+    """Decode an image from disk and match it to the display format"""
+    return display_format(pygame.image.load(path))
+
+
+class AssetCache:
+    """A class to load each image once and share it between sprites"""
+
+    def __init__(self, ai_game):
+        """Initializes the cache"""
+        self.settings = ai_game.settings
+
+        # Surfaces keyed on (path, rotation, scale)
+        self.images = {}
+        # Fonts keyed on (path, size)
+        self.fonts = {}
+        # Sounds keyed on file name, e.g. 'sfx_laser1.ogg'
+        self.sounds = {}
+
+        # Thread loading assets the first frames don't need, and the images
+        # it decoded, which still need converting on the main thread
+        self.loader = None
+        self.loaded_images = []
+
+        # Names found in the sprite sheet are cut from it instead of loaded
+        self.atlas = SpriteAtlas(self.settings.atlas_xml, load_image)
+
+    def image(self, path, rotation=0.0, scale=None):
+        """
+        Return the surface for path with the given transform applied
+        :param path: A file path, or an image name from the sprite sheet
+        :return: pygame.Surface
+        """
+        key = (path, rotation, scale)
+        image = self.images.get(key)
+        if image is None:
+            if rotation or scale:
+                # Transform the untouched image, which is cached as well
+                image = self.image(path)
+                if rotation:
+                    image = pygame.transform.rotate(image, rotation)
+                if scale:
+                    image = pygame.transform.smoothscale(image, scale)
+            elif path in self.atlas:
+                image = self.atlas.image(path)
+            else:
+                image = load_image(path)
+            self.images[key] = image
+        return image
+
+    def font(self, path, size):
+        """Return a font loaded from a font file, cached on (path, size)"""
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.Font(path, size)
+        return font
+
+    def sound(self, name):
+        """Return a loaded sound, or None if it isn't loaded or there's no audio"""
+        return self.sounds.get(name)
+
+    def load_in_background(self, images=(), sound_dir=None):
+        """
+        Start loading assets the first frames can do without on another thread
+        :param images: Image paths to decode
+        :param sound_dir: Folder whose .ogg files to load as sounds
+        :return: None
+        """
+        self.loader = threading.Thread(
+            target=self._load_in_background, args=(list(images), sound_dir),
+            name='AssetLoader', daemon=True,
+        )
+        self.loader.start()
+
+    @property
+    def loading(self):
+        """True while the background thread is still loading"""
+        return self.loader is not None and self.loader.is_alive()
+
+    def finish_loading(self):
+        """Wait for the background thread, then cache the images it decoded"""
+        if self.loader is None:
+            return
+        self.loader.join()
+        self.loader = None
+        for path, image in self.loaded_images:
+            # Matching the display format has to happen on the main thread
+            self.images[(path, 0.0, None)] = display_format(image)
+        self.loaded_images = []
+
+    def preload(self):
+        """Load every sprite image up front so no decode happens mid game"""
+        self.image(self.settings.ship_image)
+        for alien_image in self.settings.alien_kinds.values():
+            self.image(alien_image)
+        for kind in self.settings.projectile_kinds.values():
+            self.image(kind['image'], kind.get('rotation', 0.0))
+        for star_image in self.settings.star_images:
+            self.image(star_image)
+        for bursts in self.settings.particle_effects.values():
+            for burst in bursts:
+                for path in burst['images']:
+                    self.image(path, 0.0, burst.get('scale'))
+
+    def _load_in_background(self, images, sound_dir):
+        """Decode images and load sounds; runs on the loader thread"""
+        for path in images:
+            self.loaded_images.append((path, pygame.image.load(path)))
+
+        if sound_dir is None:
+            return
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            # No audio device, so the game plays silently
+            return
+        for name in sorted(os.listdir(sound_dir)):
+            if name.endswith('.ogg'):
+                self.sounds[name] = pygame.mixer.Sound(os.path.join(sound_dir, name))
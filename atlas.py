@@ -0,0 +1,41 @@
+import os
+import xml.etree.ElementTree as ElementTree
+
+import pygame
+
+
+class SpriteAtlas:
+    """A class to hand out named images from a single sprite sheet"""
+
+    def __init__(self, xml_path, load_image):
+        """
+        Read the sheet's layout; the sheet image loads on first use
+        :param load_image: Function that loads an image file, e.g.
+            assets.load_image
+        """
+        self.xml_path = xml_path
+        self.load_image = load_image
+        self.sheet = None
+
+        # Map each SubTexture name to its rect on the sheet
+        self.regions = {}
+        root = ElementTree.parse(xml_path).getroot()
+        self.sheet_path = os.path.join(
+            os.path.dirname(xml_path), root.get('imagePath')
+        )
+        for sub_texture in root.iter('SubTexture'):
+            self.regions[sub_texture.get('name')] = pygame.Rect(
+                int(sub_texture.get('x')),
+                int(sub_texture.get('y')),
+                int(sub_texture.get('width')),
+                int(sub_texture.get('height')),
+            )
+
+    def __contains__(self, name):
+        return name in self.regions
+
+    def image(self, name):
+        """Return the named image as a subsurface of the sheet"""
+        if self.sheet is None:
+            self.sheet = self.load_image(self.sheet_path)
+        return self.sheet.subsurface(self.regions[name])
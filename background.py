@@ -0,0 +1,82 @@
+import pygame
+
+
+class Background:
+    """A class to draw the backdrop with one blit per layer"""
+
+    def __init__(self, ai_game):
+        """Initializes the background from the game's settings"""
+        self.settings = ai_game.settings
+        self.assets = ai_game.assets
+        self.stars = ai_game.stars
+        self.viewport = ai_game.viewport
+
+        # Bumped on every rebuild so renderers know to redraw everything
+        self.version = 0
+        self.size = None
+        self.surface = None
+
+        # Scroll offset of each parallax layer, in pixels
+        self.offsets = [0.0 for _ in self.settings.parallax_layers]
+
+    @property
+    def scrolling(self):
+        """True if any layer moves, so the backdrop changes every frame"""
+        return bool(self.settings.parallax_layers)
+
+    def invalidate(self):
+        """Rebuild the baked layer before the next draw"""
+        self.surface = None
+
+    def update(self, dt):
+        """Scroll the parallax layers down the screen"""
+        for index, (_, speed) in enumerate(self.settings.parallax_layers):
+            self.offsets[index] += speed * dt
+
+    def draw(self, screen, area=None):
+        """
+        Draw the background onto screen
+        :param screen: Surface to draw on
+        :param area: Only draw inside this rect if given, to erase sprites
+        :return: None
+        """
+        if self.surface is None or self.size != screen.get_size():
+            self._bake(screen.get_size())
+
+        if area is None:
+            screen.blit(self.surface, (0, 0))
+        else:
+            screen.blit(self.surface, area, area)
+
+        for index, (path, _) in enumerate(self.settings.parallax_layers):
+            self._draw_layer(screen, path, self.offsets[index], area)
+
+    def _bake(self, size):
+        """Combine bg_color, bg_image and every star into one surface"""
+        self.size = size
+        self.surface = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert()
+        self.surface.fill(self.settings.bg_color)
+
+        # The image is only scaled here, never while drawing frames
+        if self.settings.show_bg_image:
+            self.surface.blit(self.assets.image(self.settings.bg_image, scale=size), (0, 0))
+
+        self.surface.blits(self.viewport.items(
+            (star.image, star.rect) for star in self.stars
+        ), doreturn=False)
+        self.version += 1
+
+    def _draw_layer(self, screen, path, offset, area):
+        """Draw a screen-sized layer wrapped around vertically"""
+        layer = self.assets.image(path, scale=self.size)
+        height = self.size[1]
+        y = int(offset) % height
+        # The layer's bottom slice wraps around to the top of the screen
+        for top in (y - height, y):
+            if area is None:
+                screen.blit(layer, (0, top))
+            else:
+                source = area.move(0, -top).clip(layer.get_rect())
+                screen.blit(layer, source.move(0, top), source)
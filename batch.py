@@ -0,0 +1,219 @@
+"""
+Run many headless games in parallel to tune the game's settings.
+
+Every run plays one game with its own seed and Settings overrides, on a pool
+of worker processes, and writes one JSON line of metrics to the results file
+as soon as it finishes.
+
+Usage: python batch.py [--runs N] [--workers N] [--policy scripted|random]
+                       [--set NAME=VALUE ...] [--sweep NAME=V1,V2,... ...]
+                       [--output PATH]
+e.g.   python batch.py --runs 8 --sweep speedup_scale=1.1,1.2,1.3
+"""
+import argparse
+import ast
+import itertools
+import json
+import multiprocessing
+import os
+import random
+from time import perf_counter
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import simulation
+from settings import Settings
+from simulation import Simulation
+
+# Each worker loads the sprite images once and shares them between its runs
+_assets = None
+
+
+def scripted_policy(rng):
+    """Return a policy that strafes across the screen and fires constantly"""
+    def actions(frame):
+        actions = set()
+        if (frame // 60) % 2:
+            actions.add(simulation.MOVE_LEFT)
+        else:
+            actions.add(simulation.MOVE_RIGHT)
+        if frame % 4 == 0:
+            actions.add(simulation.FIRE)
+            actions.add(simulation.SUPER_FIRE)
+        return actions
+    return actions
+
+
+def random_policy(rng):
+    """Return a policy that wanders and fires at random"""
+    held = set()
+
+    def actions(frame):
+        # Pick a new direction about twice a second
+        if rng.random() < 1 / 30:
+            held.clear()
+            held.add(rng.choice((simulation.MOVE_LEFT, simulation.MOVE_RIGHT)))
+            if rng.random() < 0.3:
+                held.add(rng.choice((simulation.MOVE_UP, simulation.MOVE_DOWN)))
+        actions = set(held)
+        if rng.random() < 0.2:
+            actions.add(simulation.FIRE)
+        if rng.random() < 0.02:
+            actions.add(simulation.SUPER_FIRE)
+        return actions
+    return actions
+
+
+POLICIES = {
+    'scripted': scripted_policy,
+    'random': random_policy,
+}
+
+
+def apply_overrides(settings, overrides):
+    """Set each name in overrides on settings"""
+    for name, value in overrides.items():
+        if not hasattr(settings, name):
+            raise AttributeError(f"Settings has no attribute {name!r}")
+        setattr(settings, name, value)
+
+
+def run_game(spec):
+    """
+    Play one game headless and measure it
+    :param spec: dict with the run's 'run' number, 'seed', 'policy',
+        'overrides' and 'max_frames'
+    :return: dict of the spec and the run's metrics
+    """
+    global _assets
+
+    settings = Settings()
+    apply_overrides(settings, spec['overrides'])
+    sim = Simulation(settings, assets=_assets)
+    _assets = sim.assets
+    sim.start_game()
+    # start_game() resets the dynamic settings, so override them again
+    apply_overrides(settings, spec['overrides'])
+    sim.events.clear()
+
+    policy = POLICIES[spec['policy']](random.Random(spec['seed']))
+    clear_frames = []
+    level_start = 0
+    frame = 0
+    start = perf_counter()
+    while frame < spec['max_frames'] and sim.stats.game_active:
+        sim.step(policy(frame))
+        frame += 1
+        if simulation.LEVEL_CHANGED in sim.events:
+            clear_frames.append(frame - level_start)
+            level_start = frame
+        elif simulation.SHIP_HIT in sim.events:
+            # The fleet starts over, so the clock does as well
+            level_start = frame
+        sim.events.clear()
+        sim.explosions.clear()
+    elapsed = perf_counter() - start
+
+    result = dict(spec)
+    result.update({
+        'level': sim.stats.level,
+        'score': sim.stats.score,
+        'ships_left': sim.stats.ships_left,
+        'game_over': not sim.stats.game_active,
+        'frames': frame,
+        'clear_frames': clear_frames,
+        'mean_clear_frames': (sum(clear_frames) / len(clear_frames)
+                              if clear_frames else None),
+        'frames_per_second': frame / elapsed if elapsed else None,
+    })
+    return result
+
+
+def make_specs(runs, seed, policy, max_frames, overrides, sweeps):
+    """
+    Return a spec for every combination of swept values, runs times each
+    :param overrides: {name: value} applied to every run
+    :param sweeps: {name: [values]} to try every combination of
+    """
+    specs = []
+    names = list(sweeps)
+    for values in itertools.product(*(sweeps[name] for name in names)):
+        for _ in range(runs):
+            run_overrides = dict(overrides)
+            run_overrides.update(zip(names, values))
+            specs.append({
+                'run': len(specs),
+                'seed': seed + len(specs),
+                'policy': policy,
+                'overrides': run_overrides,
+                'max_frames': max_frames,
+            })
+    return specs
+
+
+def parse_value(text):
+    """Read a Python literal, or keep text as a string if it isn't one"""
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def parse_assignment(text):
+    """Split NAME=VALUE into its name and the text of its value"""
+    name, sep, value = text.partition('=')
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got {text!r}")
+    return name.strip(), value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=4,
+                        help="Games per combination of swept values")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="Worker processes (default: one per CPU)")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='scripted')
+    parser.add_argument('--seed', type=int, default=0,
+                        help="Seed of the first run; each run after it adds one")
+    parser.add_argument('--max-frames', type=int, default=60 * 60 * 5,
+                        help="Stop a game that is still going after this many frames")
+    parser.add_argument('--set', type=parse_assignment, action='append', default=[],
+                        metavar='NAME=VALUE', help="Override a setting in every run")
+    parser.add_argument('--sweep', type=parse_assignment, action='append', default=[],
+                        metavar='NAME=V1,V2', help="Try each value of a setting")
+    parser.add_argument('--output', default='batch_results.jsonl',
+                        help="JSON Lines file to write one result per run to")
+    args = parser.parse_args()
+
+    overrides = {name: parse_value(value) for name, value in args.set}
+    sweeps = {
+        name: [parse_value(value) for value in values.split(',')]
+        for name, values in args.sweep
+    }
+    # Catch misspelled settings before starting any workers
+    apply_overrides(Settings(), overrides)
+    apply_overrides(Settings(), {name: values[0] for name, values in sweeps.items()})
+    specs = make_specs(args.runs, args.seed, args.policy, args.max_frames,
+                       overrides, sweeps)
+
+    frames = 0
+    start = perf_counter()
+    with multiprocessing.Pool(args.workers) as pool, open(args.output, 'w') as file:
+        # Results arrive in whatever order the runs finish
+        for result in pool.imap_unordered(run_game, specs):
+            file.write(json.dumps(result) + '\n')
+            file.flush()
+            frames += result['frames']
+            print(f"run {result['run']:>4}: level {result['level']:>3}, "
+                  f"score {result['score']:>8}, {result['frames']:>6} frames, "
+                  f"{result['frames_per_second']:>7.0f} frames/s  {result['overrides']}")
+    elapsed = perf_counter() - start
+    print(f"{len(specs)} runs, {frames} frames in {elapsed:.1f} s "
+          f"({frames / elapsed:.0f} frames/s over {args.workers} workers). "
+          f"Results are in {args.output}")
+
+
+if __name__ == '__main__':
+    main()
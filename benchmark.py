@@ -0,0 +1,388 @@
+"""
+Headless benchmarks for Alien Invasion.
+
+Runs the game with the SDL dummy video driver and reports frame times.
+Usage: python benchmark.py [--frames N] [--startup-runs N]
+                           [--scenario NAME] [--baseline FILE]
+                           [--save-baseline FILE] [--tolerance FRACTION]
+
+Naming scenarios runs only those, skipping the other benchmarks. With
+--baseline, scenario results worse than the file's by more than the
+tolerance are flagged and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tracemalloc
+from time import perf_counter
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import simulation
+from alien_invasion import AlienInvasion
+from settings import Settings
+from simulation import Simulation
+from star import Star
+from store import summarize_frames
+
+
+def make_settings(seed=0, **overrides):
+    """Return Settings with the given attributes overridden, seeded so runs repeat"""
+    settings = Settings()
+    settings.seed = seed
+    # Benchmark games aren't worth keeping
+    settings.save_path = None
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    return settings
+
+
+def make_game(**overrides):
+    """Create a game with the given settings overrides and start playing"""
+    ai = AlienInvasion(make_settings(**overrides))
+    ai._finish_loading()
+    ai._check_play_button(ai.play_button.rect.center)
+    return ai
+
+
+def strafe_actions(frame):
+    """Return the actions of a player strafing and firing constantly"""
+    actions = set()
+    if (frame // 60) % 2:
+        actions.add(simulation.MOVE_LEFT)
+    else:
+        actions.add(simulation.MOVE_RIGHT)
+    if frame % 4 == 0:
+        actions.add(simulation.FIRE)
+        actions.add(simulation.SUPER_FIRE)
+    return actions
+
+
+def play_frame(ai, frame, dt=1.0):
+    """Advance the game by one frame while strafing and firing"""
+    ai.sim.step(strafe_actions(frame), dt)
+    ai._handle_sim_events()
+
+
+def summarize(name, samples):
+    """Print the distribution of samples, given in seconds"""
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{name:<28} mean {statistics.mean(samples) * 1000:7.3f} ms"
+          f"  p50 {statistics.median(samples) * 1000:7.3f} ms"
+          f"  p95 {p95 * 1000:7.3f} ms")
+
+
+def bench_render_modes(frames):
+    """Compare the cost of _update_screen in each render mode, at 1080p and 4K"""
+    for window_size in (None, (3840, 2160)):
+        for mode in ('full', 'dirty'):
+            ai = make_game(render_mode=mode, window_size=window_size)
+            samples = []
+            for frame in range(frames):
+                play_frame(ai, frame)
+                start = perf_counter()
+                ai._update_screen()
+                samples.append(perf_counter() - start)
+            name = f"render_mode={mode}"
+            if window_size:
+                name += " at {}x{}".format(*window_size)
+            summarize(name, samples)
+
+
+def bench_projectile_draw(frames):
+    """Compare one blit per projectile with a single blits() call"""
+    kinds = Settings().projectile_kinds
+    for count in (0, 50, 99, 200, 400):
+        ai = make_game(projectile_kinds=dict(
+            kinds, super_bullet=dict(kinds['super_bullet'], inventory=count)
+        ))
+        super_bullets = ai.sim.projectiles['super_bullet']
+        for index in range(count):
+            # Spread the projectiles out over the screen
+            projectile = super_bullets.fire()
+            projectile.rect.topleft = (index * 37 % 1900, index * 53 % 1000)
+
+        loop_samples = []
+        batch_samples = []
+        for _ in range(frames):
+            start = perf_counter()
+            for projectile in super_bullets:
+                ai.screen.blit(projectile.image, projectile.rect)
+            loop_samples.append(perf_counter() - start)
+
+            start = perf_counter()
+            ai.batch.add('entities', (
+                (projectile.image, projectile.rect) for projectile in super_bullets
+            ))
+            ai.batch.draw(ai.screen)
+            batch_samples.append(perf_counter() - start)
+        summarize(f"{count} projectiles, blit loop", loop_samples)
+        summarize(f"{count} projectiles, batched", batch_samples)
+
+
+def bench_particles(frames):
+    """Measure a frame of particles with the whole budget alive"""
+    ai = make_game()
+    particles = ai.particles
+    samples = []
+    for frame in range(frames):
+        # Far more explosions than the budget holds, so every slot is used
+        particles.emit('alien', [(frame * 37 % 1900, frame * 53 % 1000)] * 100)
+        start = perf_counter()
+        particles.update(1.0)
+        particles.draw(ai.screen)
+        samples.append(perf_counter() - start)
+    summarize(f"{len(particles)} particles", samples)
+
+
+def bench_headless(frames):
+    """Measure how fast the simulation runs with nothing drawn"""
+    sim = Simulation(make_settings())
+    sim.start_game()
+    start = perf_counter()
+    for frame in range(frames):
+        sim.step(strafe_actions(frame))
+        sim.events.clear()
+        sim.explosions.clear()
+    elapsed = perf_counter() - start
+    print(f"{'headless simulation':<28} {frames / elapsed:10.0f} steps/s")
+
+
+# ------------ Scenarios ------------
+# Each builds a game and returns a function that plays one frame of it.
+# Levels play the same however many are cleared, so no frame is slower
+# only because the game sped up.
+STEADY = {'speedup_scale': 1.0, 'score_scale': 1.0}
+# Frames played before measuring, so first-use caches are filled
+WARMUP_FRAMES = 10
+
+
+def draw_frame(ai, actions=()):
+    """Step the simulation once, then draw the frame"""
+    ai.sim.step(set(actions))
+    ai._handle_sim_events()
+    ai._update_screen()
+
+
+def scenario_fleet_idle():
+    """A full fleet crossing the screen with nothing fired"""
+    ai = make_game(**STEADY)
+    return lambda frame: draw_frame(ai)
+
+
+def scenario_super_bullets():
+    """99 super bullets in flight, spread over the screen, against the fleet"""
+    ai = make_game(**STEADY)
+    super_bullets = ai.sim.projectiles['super_bullet']
+    width = ai.settings.screen_width
+    height = ai.settings.screen_height
+
+    def play(frame):
+        # Replace the ones that hit or left with new ones along the bottom
+        while super_bullets.free:
+            index = len(super_bullets)
+            super_bullets.fire().reset((index * 97 % width, height - index * 7 % 300))
+        draw_frame(ai, strafe_actions(frame) - {simulation.FIRE, simulation.SUPER_FIRE})
+    return play
+
+
+def scenario_level_clears():
+    """The fleet destroyed every frame, so each frame resets the entities"""
+    ai = make_game(**STEADY)
+    aliens = ai.sim.aliens
+
+    def play(frame):
+        aliens.kill(aliens.alive.nonzero()[0])
+        draw_frame(ai)
+    return play
+
+
+def scenario_starfield_4k():
+    """A 4K display with a dense starfield baked into the background"""
+    ai = make_game(window_size=(3840, 2160), **STEADY)
+    for _ in range(2000):
+        ai.stars.add(Star(ai))
+    ai.background.invalidate()
+    return lambda frame: draw_frame(ai, strafe_actions(frame))
+
+
+def scenario_score_spam():
+    """The score and high score changing every frame"""
+    ai = make_game(**STEADY)
+
+    def play(frame):
+        ai.stats.score += 1230
+        ai.stats.high_score = ai.stats.score
+        ai.sb.prep_score()
+        ai.sb.prep_high_score()
+        draw_frame(ai)
+    return play
+
+
+SCENARIOS = {
+    'fleet_idle': scenario_fleet_idle,
+    'super_bullets': scenario_super_bullets,
+    'level_clears': scenario_level_clears,
+    'starfield_4k': scenario_starfield_4k,
+    'score_spam': scenario_score_spam,
+}
+# What a baseline is compared on, and the least change worth flagging
+COMPARED = {'p50_ms': 0.05, 'p95_ms': 0.05, 'alloc_kib': 1.0}
+
+
+def run_scenario(name, frames):
+    """
+    Play a scenario twice: once timing each frame, then once tracing the
+    memory Python allocates in each frame, which tracing would slow down.
+    Pixel memory SDL allocates for surfaces isn't traced.
+    :return: dict of frame time percentiles in ms and KiB allocated per frame
+    """
+    play = SCENARIOS[name]()
+    for frame in range(WARMUP_FRAMES):
+        play(frame)
+    frame_times = []
+    for frame in range(WARMUP_FRAMES, WARMUP_FRAMES + frames):
+        start = perf_counter()
+        play(frame)
+        frame_times.append((perf_counter() - start) * 1000)
+
+    play = SCENARIOS[name]()
+    for frame in range(WARMUP_FRAMES):
+        play(frame)
+    allocations = []
+    tracemalloc.start()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    for frame in range(WARMUP_FRAMES, WARMUP_FRAMES + frames):
+        # The most memory the frame held beyond what it started with
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        play(frame)
+        allocations.append(tracemalloc.get_traced_memory()[1] - before)
+    growth = tracemalloc.get_traced_memory()[0] - start_memory
+    tracemalloc.stop()
+
+    mean, p50, p95, p99 = summarize_frames(frame_times)
+    return {
+        'mean_ms': mean, 'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99,
+        'max_ms': max(frame_times),
+        'alloc_kib': statistics.mean(allocations) / 1024,
+        'growth_kib': growth / 1024,
+    }
+
+
+def print_scenario(name, result):
+    """Print one scenario's frame times and allocations"""
+    print(f"{name:<16} mean {result['mean_ms']:7.3f} ms  p50 {result['p50_ms']:7.3f} ms"
+          f"  p95 {result['p95_ms']:7.3f} ms  p99 {result['p99_ms']:7.3f} ms"
+          f"  max {result['max_ms']:7.3f} ms"
+          f"  alloc {result['alloc_kib']:8.1f} KiB/frame"
+          f"  growth {result['growth_kib']:8.1f} KiB")
+
+
+def compare(results, baseline, tolerance):
+    """
+    Return a message for each result worse than its baseline by more than
+    tolerance, and by more than the least change worth flagging
+    :param tolerance: Allowed slowdown as a fraction, e.g. 0.25 for 25%
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for key, least in COMPARED.items():
+            old = baseline[name][key]
+            new = result[key]
+            if new > old * (1 + tolerance) and new - old > least:
+                regressions.append(f"{name}: {key} {old:.3f} -> {new:.3f}")
+    return regressions
+
+
+def bench_scenarios(names, frames, baseline_path=None, save_path=None, tolerance=0.25):
+    """
+    Run scenarios, compare them with a baseline and save them as one
+    :return: True if nothing regressed
+    """
+    results = {}
+    for name in names:
+        results[name] = run_scenario(name, frames)
+        print_scenario(name, results[name])
+
+    regressed = False
+    if baseline_path:
+        with open(baseline_path) as file:
+            baseline = json.load(file)['scenarios']
+        regressions = compare(results, baseline, tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if not regressions:
+            print(f"No regressions against {baseline_path}")
+        regressed = bool(regressions)
+    if save_path:
+        with open(save_path, 'w') as file:
+            json.dump({'frames': frames, 'scenarios': results}, file, indent=2)
+    return not regressed
+
+
+# Run in a fresh interpreter, so imports are part of the measurement
+STARTUP_SCRIPT = """
+from time import perf_counter
+start = perf_counter()
+from alien_invasion import AlienInvasion
+from benchmark import make_settings
+import game_state
+ai = AlienInvasion(make_settings())
+ai._run_frame()
+first_frame = perf_counter() - start
+while ai.state.state == game_state.LOADING:
+    ai._run_frame()
+print(first_frame, perf_counter() - start)
+"""
+
+
+def bench_startup(runs):
+    """Measure the time from launch to the first frame and to the menu"""
+    first_frames = []
+    menus = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', STARTUP_SCRIPT],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        first_frame, menu = output.split()[-2:]
+        first_frames.append(float(first_frame))
+        menus.append(float(menu))
+    summarize("startup, first frame", first_frames)
+    summarize("startup, menu ready", menus)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--startup-runs', type=int, default=5)
+    parser.add_argument('--scenario', action='append', choices=list(SCENARIOS),
+                        help="Run only this scenario; may be given more than once")
+    parser.add_argument('--baseline', help="Flag scenarios worse than this JSON file")
+    parser.add_argument('--save-baseline', help="Save the scenario results as JSON")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Slowdown allowed against the baseline, as a fraction")
+    args = parser.parse_args()
+
+    if not args.scenario:
+        bench_startup(args.startup_runs)
+        bench_render_modes(args.frames)
+        bench_projectile_draw(args.frames)
+        bench_particles(args.frames)
+        bench_headless(args.frames)
+    passed = bench_scenarios(args.scenario or list(SCENARIOS), args.frames,
+                             args.baseline, args.save_baseline, args.tolerance)
+    if not passed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
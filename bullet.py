@@ -1,79 +0,0 @@
-import pygame
-from pygame.sprite import Sprite
-
-
-class Bullet(Sprite):
-    """A class to manage bullets fired from the ship"""
-
-    def __init__(self, ai_game):
-        """Create a bullet object at the ship's current position"""
-        super().__init__()
-        self.screen = ai_game.screen
-        self.settings = ai_game.settings
-        # self.color = self.settings.bullet_color
-
-        self.image = pygame.image.load(self.settings.bullet_image)
-        self.rect = self.image.get_rect()
-
-        # Create a bullet rect at (0, 0) and then set correct position
-        # self.rect = pygame.Rect(0, 0, self.settings.bullet_width, self.settings.bullet_height)
-        self.rect.midtop = ai_game.ship.rect.midtop
-        self.rect.width = self.settings.bullet_width
-        self.rect.height = self.settings.bullet_height
-
-        # Store the bullet's position as a decimal value
-        self.y = float(self.rect.y)
-
-    def update(self, dt):
-        """Move the bullet up the screen."""
-        # Update the decimal position of the bullet
-        self.y -= self.settings.bullet_speed * dt
-        # Update the rect position
-        self.rect.y = self.y
-
-    # def draw_bullet(self):
-    #     """Draw the bullet to the screen"""
-    #     pygame.draw.rect(self.screen, self.color, self.rect)
-
-    def blitme(self):
-        """Draw the bullet at its current location"""
-        self.screen.blit(self.image, self.rect)
-
-
-class SuperBullet(Sprite):
-    """A class to manage bullets fired from the ship"""
-
-    def __init__(self, ai_game):
-        """Create a bullet object at the ship's current position"""
-        super().__init__()
-        self.screen = ai_game.screen
-        self.settings = ai_game.settings
-        # self.color = self.settings.bullet_color
-
-        self.importedimage = pygame.image.load(self.settings.super_bullet_image)
-        self.image = pygame.transform.rotate(self.importedimage, 90.0)
-        self.rect = self.image.get_rect()
-
-
-        # Create a bullet rect at (0, 0) and then set correct position
-        # self.rect = pygame.Rect(0, 0, self.settings.bullet_width, self.settings.bullet_height)
-        self.rect.midtop = ai_game.ship.rect.midtop
-        self.rect.width = self.settings.super_bullet_width
-        self.rect.height = self.settings.super_bullet_height
-        # Store the bullet's position as a decimal value
-        self.y = float(self.rect.y)
-
-    def update(self, dt):
-        """Move the bullet up the screen."""
-        # Update the decimal position of the bullet
-        self.y -= self.settings.super_bullet_speed * dt
-        # Update the rect position
-        self.rect.y = self.y
-
-    # def draw_bullet(self):
-    #     """Draw the bullet to the screen"""
-    #     pygame.draw.rect(self.screen, self.color, self.rect)
-
-    def blitme(self):
-        """Draw the bullet at its current location"""
-        self.screen.blit(self.image, self.rect)
@@ -1,17 +1,21 @@
 import pygame.font
 
+from glyphs import GlyphCache, TextLine
+
 class Button:
 
     def __init__(self, ai_game, msg):
         """Initializes button attributes"""
         self.screen = ai_game.screen
-        self.screen_rect = self.screen.get_rect()
+        # Laid out on the logical playfield, like every sprite
+        self.screen_rect = ai_game.viewport.rect
+        self.settings = ai_game.settings
 
         # Set the dimensions and properties of the button.
         self.width, self.height = 200, 50
         self.button_color = (0, 255, 0)
         self.text_color = (255, 255, 255)
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = ai_game.assets.font(self.settings.font_path, self.settings.font_size)
 
         # Build the button's rect object and center it
         self.rect = pygame.Rect(0, 0, self.width, self.height)
@@ -22,11 +26,19 @@ class Button:
 
     def _prep_msg(self, msg):
         """Turn msg into a rendered image and center text on the button"""
-        self.msg_image = self.font.render(msg, True, self.text_color, self.button_color)
+        msg_line = TextLine(GlyphCache(self.font, self.text_color))
+        msg_line.render(msg)
+        self.msg_image = msg_line.image
         self.msg_image_rect = self.msg_image.get_rect()
         self.msg_image_rect.center = self.rect.center
 
+        # Compose the whole button once so it can be drawn with a single blit
+        self.image = pygame.Surface(self.rect.size)
+        self.image.fill(self.button_color)
+        self.image.blit(
+            self.msg_image, self.msg_image.get_rect(center=self.image.get_rect().center)
+        )
+
     def draw_button(self):
-        # Draw blank button and then draw message
-        self.screen.fill(self.button_color, self.rect)
-        self.screen.blit(self.msg_image, self.msg_image_rect)
\ No newline at end of file
+        # Draw the prepared button and message
+        self.screen.blit(self.image, self.rect)
\ No newline at end of file
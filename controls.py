@@ -0,0 +1,111 @@
+import pygame
+
+import simulation
+from store import HIGH_SCORE_LOADED
+
+# Not a simulation action: the game closes as soon as it's pressed
+QUIT = 'quit'
+
+# Actions that last as long as their key is held down
+HELD_ACTIONS = (
+    simulation.MOVE_LEFT, simulation.MOVE_RIGHT,
+    simulation.MOVE_UP, simulation.MOVE_DOWN,
+)
+
+# The only events the game reads; SDL drops every other kind unqueued
+ALLOWED_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, HIGH_SCORE_LOADED)
+
+
+class Controls:
+    """A class to turn the keyboard into the actions of each simulation step"""
+
+    def __init__(self, ai_game):
+        """
+        Initializes the key map from settings.key_bindings and keeps SDL
+        from queueing events the game never reads
+        :return: None
+        """
+        self.settings = ai_game.settings
+        # Key code -> action
+        self.bindings = {
+            pygame.key.key_code(name): action
+            for name, action in self.settings.key_bindings.items()
+        }
+        # Action -> key codes bound to it, for polling held keys
+        self.keys = {}
+        for key, action in self.bindings.items():
+            self.keys.setdefault(action, []).append(key)
+        # Firing action -> projectile kind it fires, for autofire
+        self.fire_actions = {
+            kind['action']: name for name, kind in self.settings.projectile_kinds.items()
+        }
+
+        # Actions held down when the keyboard was last polled
+        self.held = set()
+        # Actions triggered since the last step, buffered until it runs
+        self.triggered = set()
+        # Firing action -> steps left until holding its key fires again
+        self.cooldowns = {}
+
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(ALLOWED_EVENTS)
+
+    def key_down(self, key):
+        """
+        Buffer the action a key press triggers
+        :param key: The event's key code
+        :return: The action, or None if the key isn't bound
+        """
+        action = self.bindings.get(key)
+        # A tap shorter than a frame still moves the ship for one step
+        if action is not None and action != QUIT:
+            self.trigger(action)
+        return action
+
+    def trigger(self, action):
+        """Buffer an action for the next step"""
+        self.triggered.add(action)
+        if action in self.fire_actions:
+            # Holding the key fires again once the cooldown runs out
+            self.cooldowns[action] = self._autofire_interval(action)
+
+    def poll(self):
+        """Read which bound keys are held down, once per frame"""
+        pressed = pygame.key.get_pressed()
+        self.held = {
+            action for action, keys in self.keys.items()
+            if any(pressed[key] for key in keys)
+        }
+
+    def actions(self, dt):
+        """
+        Return the actions of the next step and empty the buffer
+        :param dt: Length of the step, in frames at 60 FPS
+        :return: set of actions
+        """
+        actions = {action for action in self.held if action in HELD_ACTIONS}
+        actions |= self.triggered
+        self.triggered.clear()
+
+        # Firing keys held down keep firing, as fast as the cooldown allows
+        for action in self.fire_actions:
+            cooldown = self.cooldowns.get(action, 0.0) - dt
+            if action in self.held and action not in actions and cooldown <= 0.0:
+                actions.add(action)
+                cooldown = self._autofire_interval(action)
+            self.cooldowns[action] = cooldown
+        return actions
+
+    def clear(self):
+        """Forget buffered presses, e.g. ones made during a pause"""
+        self.triggered.clear()
+
+    def _autofire_interval(self, action):
+        """
+        Return the steps between shots of a held firing key: as often as the
+        kind's inventory can keep up with, spread over its flight up the screen
+        """
+        name = self.fire_actions[action]
+        kind = self.settings.projectile_kinds[name]
+        flight = self.settings.screen_height / self.settings.projectile_speeds[name]
+        return max(self.settings.autofire_min_interval, flight / kind['inventory'])
@@ -0,0 +1,281 @@
+import math
+
+import numpy as np
+
+from spatial import SpatialGrid
+
+
+class FleetLayout:
+    """A class to hold a fleet's starting arrays so a fleet can be reset to them"""
+
+    def __init__(self, kind, x, rect_x, y, rect_y, width, height, grid):
+        """Initializes the layout. The arrays are never changed after this."""
+        self.kind = kind
+        self.x = x
+        self.rect_x = rect_x
+        self.y = y
+        self.rect_y = rect_y
+        self.width = width
+        self.height = height
+        self.grid = grid
+
+    def __len__(self):
+        return len(self.x)
+
+
+class Fleet:
+    """A class to manage the alien fleet as arrays instead of sprites"""
+
+    def __init__(self, ai_game):
+        """Initializes an empty fleet"""
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+
+        # Aliens of a kind share one image. Kinds are numbered in the order
+        # of settings.alien_kinds.
+        self.kinds = list(self.settings.alien_kinds)
+        self.images = [
+            ai_game.assets.image(image) for image in self.settings.alien_kinds.values()
+        ]
+        self.sizes = np.array([image.get_size() for image in self.images], dtype=int)
+        # Formations are laid out in cells the size of an 'X'
+        self.base_kind = self.kinds.index('X')
+        self.alien_width, self.alien_height = self.sizes[self.base_kind].tolist()
+
+        # Collisions are looked up in a grid built where the fleet started.
+        # The whole fleet moves together, so instead of rebuilding the grid
+        # every frame, queries are shifted back by how far it has moved.
+        self.grid = SpatialGrid(max(self.alien_width, self.alien_height))
+
+        self.alive = np.ones(0, dtype=bool)
+        self.empty()
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    def __bool__(self):
+        return bool(self.alive.any())
+
+    def empty(self):
+        """Remove every alien"""
+        self.fill(np.empty(0), np.empty(0))
+
+    def fill(self, xs, ys, kinds=None):
+        """
+        Replace the fleet with one alien at each position
+        :param xs: Left edges of the aliens' cells
+        :param ys: Top edges of the aliens' cells
+        :param kinds: Kind number of each alien; all 'X' if left out
+        :return: None
+        """
+        self.reset(self.layout(xs, ys, kinds))
+
+    def layout(self, xs, ys, kinds=None):
+        """
+        Work out everything a fleet at these positions starts with, so
+        reset() can bring it back without doing that work again
+        :param xs: Left edges of the aliens' cells
+        :param ys: Top edges of the aliens' cells
+        :param kinds: Kind number of each alien; all 'X' if left out
+        :return: FleetLayout
+        """
+        if kinds is None:
+            kind = np.full(len(xs), self.base_kind, dtype=int)
+        else:
+            kind = np.array(kinds, dtype=int)
+        width = self.sizes[kind, 0]
+        height = self.sizes[kind, 1]
+
+        # Exact positions, and the whole pixels they are drawn at. Each
+        # alien is centered in its cell.
+        x = np.array(xs, dtype=float) + (self.alien_width - width) // 2
+        rect_x = self._to_pixels(x)
+        y = np.array(ys, dtype=float) + (self.alien_height - height) // 2
+        rect_y = self._to_pixels(y)
+
+        grid = SpatialGrid(self.grid.cell_size)
+        grid.build(rect_x.tolist(), rect_y.tolist(),
+                   (rect_x + width).tolist(), (rect_y + height).tolist())
+
+        for array in (kind, x, rect_x, y, rect_y, width, height):
+            array.flags.writeable = False
+        return FleetLayout(kind, x, rect_x, y, rect_y, width, height, grid)
+
+    def reset(self, layout):
+        """Replace the fleet with a fresh copy of layout"""
+        self.x = layout.x.copy()
+        self.prev_x = layout.x.copy()
+        self.rect_x = layout.rect_x.copy()
+        self.y = layout.y.copy()
+        self.rect_y = layout.rect_y.copy()
+        # Kinds and sizes never change during a level, so they can be shared
+        self.kind = layout.kind
+        self.width = layout.width
+        self.height = layout.height
+        if len(self.alive) == len(layout):
+            self.alive.fill(True)
+        else:
+            self.alive = np.ones(len(layout), dtype=bool)
+
+        self.grid.load(layout.grid)
+        self.shift_x = 0.0
+        self.shift_y = 0.0
+
+    def update(self, dt):
+        """Move the fleet sideways"""
+        distance = (self.settings.alien_speed * self.settings.fleet_direction) * dt
+        # Keep the positions before the move, to draw in between
+        np.copyto(self.prev_x, self.x)
+        self.x += distance
+        self.rect_x = self._to_pixels(self.x)
+        self.shift_x += distance
+
+    def check_edges(self):
+        """Return True if any alien is at an edge of the screen"""
+        screen_rect = self.screen.get_rect()
+        at_edge = ((self.rect_x + self.width >= screen_rect.right)
+                   | (self.rect_x <= 0))
+        return bool((at_edge & self.alive).any())
+
+    def drop(self, distance):
+        """Move the whole fleet down"""
+        self.y += distance
+        self.rect_y = self._to_pixels(self.y)
+        self.shift_y += distance
+
+    def check_bottom(self):
+        """Return True if any alien has reached the bottom of the screen"""
+        screen_rect = self.screen.get_rect()
+        at_bottom = self.rect_y + self.height >= screen_rect.bottom
+        return bool((at_bottom & self.alive).any())
+
+    def collide_projectiles(self, projectiles):
+        """
+        Kill the aliens each projectile hit, in order, the way groupcollide()
+        does: aliens hit by one projectile can't be hit by the next
+        :param projectiles: Objects with a rect, and the prev_rect it had
+            before its last move. Each hits the first aliens along its path.
+        :return: (projectile index, killed alien indices) for each that hit
+        """
+        hits = []
+        for index, projectile in enumerate(projectiles):
+            rect = projectile.rect
+            if projectile.prev_rect == rect:
+                killed = self._collide(rect)
+            else:
+                killed = self._collide_swept(projectile.prev_rect, rect)
+            if killed:
+                self.kill(killed)
+                hits.append((index, killed))
+        return hits
+
+    def collide_any(self, rect):
+        """Return True if any living alien overlaps rect"""
+        return bool(self._collide(rect))
+
+    def kill(self, indices):
+        """Remove the aliens at indices from the fleet"""
+        self.alive[indices] = False
+        for index in indices:
+            self.grid.remove(index)
+
+    def _collide(self, rect):
+        """Return the indices of living aliens overlapping rect, like colliderect()"""
+        return self._collide_area(rect.left, rect.top, rect.right, rect.bottom)
+
+    def _collide_area(self, left, top, right, bottom):
+        """Return the indices of living aliens overlapping an area"""
+        if left >= right or top >= bottom:
+            return []
+
+        # Only living aliens are in the grid. Rounding to pixels can put an
+        # alien a pixel off the shift, so search a little wider.
+        shift_x = int(self.shift_x)
+        shift_y = int(self.shift_y)
+        candidates = self.grid.query(
+            left - shift_x - 2, top - shift_y - 2,
+            right - shift_x + 2, bottom - shift_y + 2,
+        )
+
+        # Few aliens share a cell, so test them one by one
+        return sorted(
+            index for index in candidates
+            if self.rect_x[index] < right
+            and self.rect_x[index] + self.width[index] > left
+            and self.rect_y[index] < bottom
+            and self.rect_y[index] + self.height[index] > top
+        )
+
+    def _collide_swept(self, start, end):
+        """
+        Return the indices of the living aliens a rect moving from start to
+        end touches first, so nothing behind them is hit as well
+        """
+        # Everything the rect passed over, without making a Rect for it
+        candidates = self._collide_area(
+            min(start.left, end.left), min(start.top, end.top),
+            max(start.right, end.right), max(start.bottom, end.bottom),
+        )
+        if len(candidates) < 2:
+            return candidates
+
+        # Find the part of the move during which the rect overlaps each alien
+        dx = end.x - start.x
+        dy = end.y - start.y
+        entries = {}
+        for index in candidates:
+            x_entry, x_exit = self._overlap(start.x, start.width, dx,
+                                            int(self.rect_x[index]), int(self.width[index]))
+            y_entry, y_exit = self._overlap(start.y, start.height, dy,
+                                            int(self.rect_y[index]), int(self.height[index]))
+            entry = max(x_entry, y_entry, 0.0)
+            # A diagonal move's bounding box covers corners it never passes
+            if entry < min(x_exit, y_exit, 1.0):
+                entries[index] = entry
+        if not entries:
+            return []
+        first = min(entries.values())
+        return [index for index, entry in entries.items() if entry <= first]
+
+    @staticmethod
+    def _overlap(position, size, distance, other_position, other_size):
+        """
+        Return the fractions of a move along one axis between which a span
+        overlaps another, unbounded if it doesn't move along the axis
+        """
+        if distance:
+            enter = (other_position - size - position) / distance
+            leave = (other_position + other_size - position) / distance
+            return min(enter, leave), max(enter, leave)
+        if position < other_position + other_size and position + size > other_position:
+            return -math.inf, math.inf
+        return math.inf, -math.inf
+
+    def centers(self, indices):
+        """Return the (x, y) center of each alien at indices"""
+        indices = np.asarray(indices, dtype=int)
+        return np.column_stack((
+            self.rect_x[indices] + self.width[indices] // 2,
+            self.rect_y[indices] + self.height[indices] // 2,
+        ))
+
+    def blit_items(self, alpha=1.0):
+        """
+        Return an (image, position) pair for each living alien
+        :param alpha: How far through the last move to draw the fleet, 0 to 1
+        """
+        if alpha >= 1.0:
+            xs = self.rect_x[self.alive]
+        else:
+            xs = self._to_pixels(self.prev_x + (self.x - self.prev_x) * alpha)[self.alive]
+        images = self.images
+        return [
+            (images[kind], (x, y)) for kind, x, y in zip(
+                self.kind[self.alive].tolist(), xs.tolist(), self.rect_y[self.alive].tolist()
+            )
+        ]
+
+    @staticmethod
+    def _to_pixels(x):
+        """Round positions to whole pixels the way Rect does, half away from 0"""
+        return np.trunc(x + np.copysign(0.5, x)).astype(int)
@@ -0,0 +1,84 @@
+import numpy as np
+
+
+class Formations:
+    """A class to work out each fleet formation once and hand out its layout"""
+
+    def __init__(self, ai_game):
+        """Initializes an empty cache of layouts"""
+        self.settings = ai_game.settings
+        self.aliens = ai_game.aliens
+        self.ship = ai_game.ship
+
+        # FleetLayouts keyed on the formation and everything its positions
+        # depend on, so a new screen size or sprite gets a new layout
+        self.layouts = {}
+
+    def layout(self, name):
+        """
+        Return the layout of a formation
+        :param name: 'grid', or a key of settings.formations
+        :return: FleetLayout
+        """
+        key = (
+            name,
+            self.settings.screen_width, self.settings.screen_height,
+            self.aliens.alien_width, self.aliens.alien_height,
+            self.ship.rect.height,
+        )
+        layout = self.layouts.get(key)
+        if layout is None:
+            if name == 'grid':
+                xs, ys = self._grid()
+                kinds = None
+            else:
+                xs, ys, kinds = self._pattern(self.settings.formations[name])
+            layout = self.layouts[key] = self.aliens.layout(xs, ys, kinds)
+        return layout
+
+    def _grid(self):
+        """Return the positions of as many rows of aliens as fit on the screen"""
+        # Spacing between each alien is equal to one alien width
+        alien_width = self.aliens.alien_width
+        alien_height = self.aliens.alien_height
+        available_space_x = self.settings.screen_width - (2 * alien_width)
+        number_aliens_x = available_space_x // (2 * alien_width)
+
+        # Determine the number of rows of aliens that can fit on the screen
+        ship_height = self.ship.rect.height
+        available_space_y = (self.settings.screen_height - (3 * alien_height) - ship_height)
+        number_rows = available_space_y // (2 * alien_height)
+
+        # The full fleet of aliens, row by row
+        alien_numbers = np.tile(np.arange(number_aliens_x), number_rows)
+        row_numbers = np.repeat(np.arange(number_rows), number_aliens_x)
+        return (
+            alien_width + 2 * alien_width * alien_numbers,
+            alien_height + 2 * alien_height * row_numbers,
+        )
+
+    def _pattern(self, rows):
+        """
+        Return the positions of the aliens in a formation drawn as text
+        :param rows: Strings where each letter of settings.alien_kinds is an
+            alien of that kind and any other character is a gap, each one
+            alien wide with an alien's width of space after it
+        :return: (xs, ys, kinds)
+        """
+        alien_width = self.aliens.alien_width
+        alien_height = self.aliens.alien_height
+        columns = max(len(row) for row in rows)
+        # Center the formation across the top of the screen
+        left = (self.settings.screen_width - (2 * columns - 1) * alien_width) // 2
+
+        # Kind number of each cell, or -1 for a gap
+        kind_numbers = {letter: number for number, letter in enumerate(self.aliens.kinds)}
+        cells = np.array(
+            [[kind_numbers.get(char, -1) for char in row.ljust(columns)] for row in rows]
+        )
+        row_numbers, alien_numbers = np.nonzero(cells >= 0)
+        return (
+            left + 2 * alien_width * alien_numbers,
+            alien_height + 2 * alien_height * row_numbers,
+            cells[row_numbers, alien_numbers],
+        )
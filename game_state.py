@@ -0,0 +1,64 @@
+# ------------ Game states ------------
+# Assets the menu can wait for are still loading in the background
+LOADING = 'loading'
+# Waiting for the player to click Play
+MENU = 'menu'
+# The simulation is running
+PLAYING = 'playing'
+# The ship was hit; everything holds still before play resumes
+RESPAWN_PAUSE = 'respawn_pause'
+# A fleet was cleared; the next one holds still before it starts moving
+LEVEL_TRANSITION = 'level_transition'
+# The last ship was lost; the final screen stays up before the menu returns
+GAME_OVER = 'game_over'
+
+
+class GameState:
+    """A class to track where the game flow is and time its pauses"""
+
+    def __init__(self, ai_game, state=MENU):
+        """Initializes the state machine, at the menu unless told otherwise"""
+        self.settings = ai_game.settings
+        self.state = state
+        # Frames left before moving on to next_state, when a pause is running
+        self.time_left = 0.0
+        self.next_state = None
+
+    def enter(self, state, duration=0.0, next_state=None):
+        """
+        Move to state, and on to next_state once duration has passed
+        :param duration: Length of the pause, in frames at 60 FPS
+        :return: None
+        """
+        self.state = state
+        self.time_left = duration
+        self.next_state = next_state
+        if next_state is not None and duration <= 0:
+            self.state = next_state
+            self.next_state = None
+
+    def update(self, dt):
+        """Run down the timer, moving on to the next state when it runs out"""
+        if self.next_state is None:
+            return
+        self.time_left -= dt
+        if self.time_left <= 0:
+            self.state = self.next_state
+            self.next_state = None
+
+    @property
+    def playing(self):
+        """True if the simulation should advance this frame"""
+        return self.state == PLAYING
+
+    def ship_hit(self):
+        """Hold still for a moment before the next ship starts"""
+        self.enter(RESPAWN_PAUSE, self.settings.respawn_pause, PLAYING)
+
+    def level_cleared(self):
+        """Hold the new fleet still for a moment before it starts"""
+        self.enter(LEVEL_TRANSITION, self.settings.level_pause, PLAYING)
+
+    def game_over(self):
+        """Leave the final screen up for a moment, then go back to the menu"""
+        self.enter(GAME_OVER, self.settings.game_over_pause, MENU)
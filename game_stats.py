@@ -16,3 +16,6 @@ class GameStats:
         self.ships_left = self.settings.ship_limit
         self.score = 0
         self.level = 1
+        # Projectiles launched, and how many of them hit an alien
+        self.shots_fired = 0
+        self.shots_hit = 0
@@ -0,0 +1,103 @@
+import string
+
+import pygame
+
+
+class GlyphCache:
+    """A class to render each character of a font and color only once"""
+
+    def __init__(self, font, color):
+        """Initializes the cache and pre-renders the digits"""
+        self.font = font
+        self.color = color
+        self.height = font.get_linesize()
+        self.glyphs = {}
+        self.blanks = {}
+
+        # Digits share the widest digit's width, so numbers keep their layout
+        # as they change and can be updated one character at a time.
+        digits = {digit: font.render(digit, True, color) for digit in string.digits}
+        digit_width = max(glyph.get_width() for glyph in digits.values())
+        for digit, glyph in digits.items():
+            cell = self._blank(digit_width)
+            cell.blit(glyph, glyph.get_rect(centerx=digit_width // 2),
+                      special_flags=pygame.BLEND_RGBA_MAX)
+            self.glyphs[digit] = cell
+
+    def glyph(self, char):
+        """Return the image of one character, rendering it on first use"""
+        glyph = self.glyphs.get(char)
+        if glyph is None:
+            rendered = self.font.render(char, True, self.color)
+            glyph = self._blank(rendered.get_width())
+            glyph.blit(rendered, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            self.glyphs[char] = glyph
+        return glyph
+
+    def blank(self, width):
+        """Return a transparent surface one line high, cached by width"""
+        blank = self.blanks.get(width)
+        if blank is None:
+            blank = self.blanks[width] = self._blank(width)
+        return blank
+
+    def _blank(self, width):
+        """Return a new transparent surface one line high"""
+        return pygame.Surface((width, self.height), pygame.SRCALPHA)
+
+
+class TextLine:
+    """A class to keep one line of text up to date by blitting cached glyphs"""
+
+    def __init__(self, glyphs):
+        """Initializes an empty line"""
+        self.glyphs = glyphs
+        self.text = None
+        self.image = None
+        # Left edge of each character on self.image
+        self.offsets = []
+
+    def render(self, text):
+        """
+        Update the line to show text, redrawing only the characters that
+        changed when the layout allows it
+        :return: True if self.image was redrawn in place rather than replaced
+        """
+        if text == self.text:
+            return False
+        if self.text is not None and len(text) == len(self.text):
+            changed = [
+                index for index, (old, new) in enumerate(zip(self.text, text))
+                if old != new
+            ]
+            if all(self._width(self.text[index]) == self._width(text[index])
+                   for index in changed):
+                for index in changed:
+                    self._draw_char(text[index], self.offsets[index], clear=True)
+                self.text = text
+                return True
+
+        # The layout changed, so compose the whole line again
+        self.offsets = []
+        width = 0
+        for char in text:
+            self.offsets.append(width)
+            width += self._width(char)
+        self.image = pygame.Surface((width, self.glyphs.height), pygame.SRCALPHA)
+        for char, offset in zip(text, self.offsets):
+            self._draw_char(char, offset)
+        self.text = text
+        return False
+
+    def _width(self, char):
+        return self.glyphs.glyph(char).get_width()
+
+    def _draw_char(self, char, offset, clear=False):
+        """Copy a glyph onto the line at offset"""
+        glyph = self.glyphs.glyph(char)
+        if clear:
+            # Multiplying by a blank glyph is a much faster clear than fill()
+            self.image.blit(self.glyphs.blank(glyph.get_width()), (offset, 0),
+                            special_flags=pygame.BLEND_RGBA_MULT)
+        # Glyphs never overlap, so take their pixels as they are
+        self.image.blit(glyph, (offset, 0), special_flags=pygame.BLEND_RGBA_MAX)
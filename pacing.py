@@ -0,0 +1,70 @@
+import math
+
+import pygame
+
+
+def to_pixel(value):
+    """Round a position to a whole pixel the way Rect does, half away from 0"""
+    return int(value + math.copysign(0.5, value))
+
+
+def interpolate(previous, current, alpha):
+    """Return the whole pixel alpha of the way from previous to current"""
+    return to_pixel(previous + (current - previous) * alpha)
+
+
+class FramePacer:
+    """A class to pace frames and run the simulation in fixed steps"""
+
+    def __init__(self, ai_game):
+        """Initializes the clock and an empty accumulator"""
+        self.settings = ai_game.settings
+        self.target_fps = ai_game.TARGET_FPS
+        self.clock = pygame.time.Clock()
+        # Time owed to the simulation, in frames at 60 FPS
+        self.accumulator = 0.0
+
+    def tick(self, idle=False):
+        """
+        Wait until the next frame is due
+        :param idle: True on screens where nothing moves, to save CPU
+        :return: How long the last frame took, in frames at 60 FPS
+        """
+        if idle:
+            frame_rate = self.settings.idle_frame_rate
+        elif self.settings.vsync:
+            # flip() already waits for the display
+            frame_rate = 0
+        else:
+            frame_rate = self.settings.max_frame_rate
+        return self.clock.tick(frame_rate) * .001 * self.target_fps
+
+    def steps(self, dt):
+        """
+        Add a frame's time to the accumulator and take out whole steps
+        :param dt: Length of the frame, in frames at 60 FPS
+        :return: The dt of each simulation step to run this frame
+        """
+        step = self.settings.sim_step
+        if not step:
+            # Variable steps: the simulation moves by however long the frame was
+            return [dt]
+
+        # After a stall, drop the time owed rather than run a burst of steps
+        self.accumulator = min(self.accumulator + dt,
+                               step * self.settings.max_steps_per_frame)
+        count = int(self.accumulator // step)
+        self.accumulator -= count * step
+        return [step] * count
+
+    @property
+    def alpha(self):
+        """How far the frame is between the last step and the next, 0 to 1"""
+        step = self.settings.sim_step
+        if not step or not self.settings.interpolate:
+            return 1.0
+        return self.accumulator / step
+
+    def reset(self):
+        """Forget any time owed to the simulation"""
+        self.accumulator = 0.0
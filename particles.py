@@ -0,0 +1,107 @@
+import math
+
+import numpy as np
+
+
+class ParticleSystem:
+    """A class to move and draw short-lived particles kept in fixed-size arrays"""
+
+    def __init__(self, ai_game):
+        """
+        Initializes an empty ring buffer of settings.particle_budget particles
+        :param ai_game: The game, whose seed the particles' randomness follows
+        :return: None
+        """
+        self.settings = ai_game.settings
+        self.rng = np.random.default_rng(ai_game.seed)
+
+        # Every image a burst can draw, and half its size to center it
+        self.images = []
+        # Effect -> (count, speed range, life, first image, number of
+        # images) of each burst it emits
+        self.effects = {}
+        for effect, bursts in self.settings.particle_effects.items():
+            self.effects[effect] = []
+            for burst in bursts:
+                first = len(self.images)
+                self.images.extend(
+                    ai_game.assets.image(path, 0.0, burst.get('scale'))
+                    for path in burst['images']
+                )
+                self.effects[effect].append((
+                    burst['count'], burst['speed'], burst['life'],
+                    first, len(burst['images']),
+                ))
+        sizes = np.array([image.get_size() for image in self.images], dtype=int)
+        self.half_sizes = sizes.reshape(-1, 2) // 2
+
+        # One slot per particle. A slot is free once its age reaches its life.
+        budget = self.settings.particle_budget
+        self.x = np.zeros(budget)
+        self.y = np.zeros(budget)
+        self.vx = np.zeros(budget)
+        self.vy = np.zeros(budget)
+        self.age = np.zeros(budget)
+        self.life = np.zeros(budget)
+        self.first_image = np.zeros(budget, dtype=int)
+        self.image_count = np.ones(budget, dtype=int)
+        # Slot the next particle goes in. Once every slot has been used this
+        # is the oldest particle, which new ones replace.
+        self.next = 0
+
+    def __len__(self):
+        return int(np.count_nonzero(self.age < self.life))
+
+    def emit(self, effect, centers):
+        """
+        Start an effect at each of centers
+        :param effect: A key of settings.particle_effects
+        :param centers: (x, y) points the particles fly out from
+        :return: None
+        """
+        centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+        budget = len(self.x)
+        for count, (min_speed, max_speed), life, first, images in self.effects[effect]:
+            # Particles that would be replaced in this same call aren't made
+            number = min(count * len(centers), budget)
+            origins = np.repeat(centers, count, axis=0)[-number:]
+            slots = (self.next + np.arange(number)) % budget
+            self.next = (self.next + number) % budget
+
+            angles = self.rng.uniform(0.0, 2 * math.pi, number)
+            speeds = self.rng.uniform(min_speed, max_speed, number)
+            self.x[slots] = origins[:, 0]
+            self.y[slots] = origins[:, 1]
+            self.vx[slots] = np.cos(angles) * speeds
+            self.vy[slots] = np.sin(angles) * speeds
+            self.age[slots] = 0.0
+            self.life[slots] = life
+            self.first_image[slots] = first
+            self.image_count[slots] = images
+
+    def update(self, dt):
+        """Move and age every slot in one pass, however many are alive"""
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        self.age += dt
+
+    def blit_items(self):
+        """Return an (image, position) pair for each living particle"""
+        alive = np.flatnonzero(self.age < self.life)
+        if not len(alive):
+            return []
+        # Each particle steps through its burst's images over its life
+        frames = (self.age[alive] / self.life[alive] * self.image_count[alive]).astype(int)
+        image_numbers = self.first_image[alive] + frames
+        half_sizes = self.half_sizes[image_numbers]
+        xs = self.x[alive].astype(int) - half_sizes[:, 0]
+        ys = self.y[alive].astype(int) - half_sizes[:, 1]
+        images = self.images
+        return [
+            (images[number], (x, y))
+            for number, x, y in zip(image_numbers.tolist(), xs.tolist(), ys.tolist())
+        ]
+
+    def draw(self, surface):
+        """Draw every living particle with a single blits() call"""
+        surface.blits(self.blit_items(), doreturn=False)
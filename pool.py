@@ -0,0 +1,62 @@
+from projectile import Projectile
+
+
+class ProjectilePool:
+    """A class to reuse a fixed set of projectiles instead of creating new ones"""
+
+    def __init__(self, ai_game, kind):
+        """Create every projectile of kind the pool will ever hand out"""
+        self.settings = ai_game.settings
+        self.ship = ai_game.ship
+        self.kind = kind
+        self.free = [Projectile(kind) for _ in range(kind.inventory)]
+        # Projectiles in flight, oldest first
+        self.active = []
+
+    def __len__(self):
+        return len(self.active)
+
+    def __iter__(self):
+        return iter(self.active)
+
+    def fire(self):
+        """Launch a free projectile from the ship, if any are left"""
+        if self.free:
+            projectile = self.free.pop()
+            projectile.reset(self.ship.rect.midtop)
+            self.active.append(projectile)
+            return projectile
+
+    def update(self, dt):
+        """Move every projectile up the screen in one pass"""
+        distance = self.settings.projectile_speeds[self.kind.name] * dt
+        for projectile in self.active:
+            projectile.prev_y = projectile.y
+            projectile.prev_rect.update(projectile.rect)
+            projectile.y -= distance
+            projectile.rect.y = projectile.y
+
+    def cull(self):
+        """Recycle the projectiles that left the screen"""
+        self._compact(lambda projectile: projectile.rect.bottom > 0)
+
+    def release(self, indices):
+        """Recycle the projectiles at the given indices of the active list"""
+        for index in sorted(indices, reverse=True):
+            self.free.append(self.active.pop(index))
+
+    def empty(self):
+        """Recycle every projectile in flight"""
+        self.free.extend(self.active)
+        self.active.clear()
+
+    def _compact(self, keep):
+        """Recycle projectiles keep() rejects, in place and in order"""
+        kept = 0
+        for projectile in self.active:
+            if keep(projectile):
+                self.active[kept] = projectile
+                kept += 1
+            else:
+                self.free.append(projectile)
+        del self.active[kept:]
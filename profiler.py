@@ -0,0 +1,97 @@
+import csv
+import json
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+
+
+class FrameProfiler:
+    """A class to time each part of a frame and keep rolling percentiles"""
+
+    def __init__(self, window):
+        """
+        Initializes the profiler
+        :param window: How many recent frames the percentiles cover
+        """
+        self.window = window
+        # Section name -> its most recent timings, in seconds
+        self.samples = {}
+
+    @contextmanager
+    def section(self, name):
+        """Time the body of a with statement as one sample of name"""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=self.window)
+            self.samples[name].append(elapsed)
+
+    def percentiles(self, name):
+        """Return the p50, p95 and p99 of a section, in milliseconds"""
+        samples = sorted(self.samples[name])
+        last = len(samples) - 1
+        return tuple(
+            samples[round(last * percent)] * 1000 for percent in (0.50, 0.95, 0.99)
+        )
+
+    def report(self):
+        """Return {section: {'p50': ms, 'p95': ms, 'p99': ms, 'frames': n}}"""
+        report = {}
+        for name, samples in self.samples.items():
+            p50, p95, p99 = self.percentiles(name)
+            report[name] = {'p50': p50, 'p95': p95, 'p99': p99, 'frames': len(samples)}
+        return report
+
+    def dump(self, path):
+        """Write the report to path, as CSV if it ends in .csv, else JSON"""
+        report = self.report()
+        with open(path, 'w', newline='') as file:
+            if path.endswith('.csv'):
+                writer = csv.writer(file)
+                writer.writerow(['section', 'p50_ms', 'p95_ms', 'p99_ms', 'frames'])
+                for name, row in report.items():
+                    writer.writerow([name, row['p50'], row['p95'], row['p99'], row['frames']])
+            else:
+                json.dump(report, file, indent=2)
+
+
+class NullProfiler:
+    """A stand-in for FrameProfiler that times nothing"""
+
+    def section(self, name):
+        return nullcontext()
+
+
+class ProfilerOverlay:
+    """A class to show the profiler's percentiles on the screen"""
+
+    def __init__(self, ai_game, profiler):
+        """Initializes the overlay in the top left corner"""
+        self.profiler = profiler
+        self.text_color = ai_game.sb.text_color
+        settings = ai_game.settings
+        self.font = ai_game.assets.font(settings.small_font_path, settings.small_font_size)
+        self.frames = 0
+        self.lines = []
+
+    def update(self):
+        """Re-render the text a couple of times a second, not every frame"""
+        self.frames += 1
+        if self.frames % 30 != 1:
+            return
+
+        self.lines = []
+        top = 10
+        for name in self.profiler.samples:
+            p50, p95, p99 = self.profiler.percentiles(name)
+            line_str = "{}: {:.2f} / {:.2f} / {:.2f} ms".format(name, p50, p95, p99)
+            image = self.font.render(line_str, True, self.text_color, None)
+            self.lines.append((image, image.get_rect(left=10, top=top)))
+            top += image.get_height()
+
+    def items(self):
+        """Return the (image, rect) pairs that make up the overlay"""
+        return self.lines
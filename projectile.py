@@ -0,0 +1,53 @@
+from pacing import interpolate
+
+
+class ProjectileKind:
+    """A class to hold what every projectile of one kind shares"""
+
+    def __init__(self, ai_game, name, spec):
+        """
+        Initializes the kind from its entry in settings.projectile_kinds
+        :param name: Key of the entry, e.g. 'bullet'
+        :param spec: dict with the kind's image, rotation, size, speed,
+            inventory, action and sound
+        :return: None
+        """
+        self.name = name
+        self.image = ai_game.assets.image(spec['image'], spec.get('rotation', 0.0))
+        self.size = spec['size']
+        self.inventory = spec['inventory']
+        self.action = spec['action']
+        # Event the simulation adds each time one is fired
+        self.fired_event = f'{name}_fired'
+
+
+class Projectile:
+    """A class to hold one projectile's position; ProjectilePool moves it"""
+
+    __slots__ = ('kind', 'image', 'rect', 'prev_rect', 'y', 'prev_y')
+
+    def __init__(self, kind):
+        """Create a projectile of kind, off the screen until it is fired"""
+        self.kind = kind
+        self.image = kind.image
+        self.rect = kind.image.get_rect()
+        # The rect before the last move, kept up to date in place
+        self.prev_rect = self.rect.copy()
+        self.y = self.prev_y = 0.0
+
+    def reset(self, midtop):
+        """Move the projectile to midtop, ready to be fired"""
+        # Center the image on midtop, then shrink the rect to the hit box
+        self.rect.size = self.image.get_size()
+        self.rect.midtop = midtop
+        self.rect.size = self.kind.size
+        self.prev_rect.update(self.rect)
+
+        # Store the projectile's position as a decimal value
+        self.y = self.prev_y = float(self.rect.y)
+
+    def draw_position(self, alpha):
+        """Return where to draw the projectile, alpha of the way through its last move"""
+        if alpha >= 1.0:
+            return self.rect.topleft
+        return self.rect.x, interpolate(self.prev_y, self.y, alpha)
@@ -0,0 +1,140 @@
+import pygame
+
+import game_state
+
+
+def entity_items(sim, alpha=1.0):
+    """
+    Return (image, position) pairs for the ship, projectiles and fleet
+    :param alpha: How far through their last step to draw them, 0 to 1
+    """
+    items = [(sim.ship.image, sim.ship.draw_position(alpha))]
+    for projectiles in sim.projectiles.values():
+        items.extend(
+            (projectile.image, projectile.draw_position(alpha))
+            for projectile in projectiles
+        )
+    items.extend(sim.aliens.blit_items(alpha))
+    return items
+
+
+def hud_items(ai_game):
+    """Return (image, rect) pairs for the HUD, which rarely changes"""
+    items = list(ai_game.sb.items())
+    if ai_game.overlay:
+        items.extend(ai_game.overlay.items())
+    if ai_game.state.state == game_state.MENU:
+        items.append((ai_game.play_button.image, ai_game.play_button.rect))
+    return items
+
+
+class RenderBatch:
+    """A class to collect blits by layer and submit each layer in one call"""
+
+    def __init__(self, layers):
+        """Initializes an empty batch with the layers in drawing order"""
+        self.layers = {layer: [] for layer in layers}
+
+    def add(self, layer, items):
+        """Queue (image, position) pairs to be drawn on a layer"""
+        self.layers[layer].extend(items)
+
+    def draw(self, surface):
+        """Draw every layer with one blits() call each, then empty the batch"""
+        for items in self.layers.values():
+            surface.blits(items, doreturn=False)
+            items.clear()
+
+
+class DirtyRenderer:
+    """A class to redraw only the parts of the screen that changed"""
+
+    def __init__(self, ai_game):
+        """Initializes the renderer"""
+        self.ai_game = ai_game
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+        self.background = ai_game.background
+
+        # Rects covered by moving sprites on the previous frame
+        self.sprite_rects = []
+        # (image, rect) pairs of static items drawn on the previous frame
+        self.static_items = []
+        # Background version the screen was last fully drawn with
+        self.background_version = None
+
+    def draw(self):
+        """Draw the frame, then push only the changed rects to the display"""
+        # A scrolling or rebuilt background changes every pixel anyway
+        full_redraw = (self.background.scrolling
+                       or self.background.surface is None
+                       or self.background.version != self.background_version)
+        if full_redraw:
+            self.background.draw(self.screen)
+            self.background_version = self.background.version
+            self.sprite_rects = []
+            self.static_items = []
+
+        screen_rect = self.screen.get_rect()
+        viewport = self.ai_game.viewport
+        sprite_items = entity_items(self.ai_game.sim, self.ai_game.alpha)
+        sprite_items.extend(self.ai_game.particles.blit_items())
+        sprite_items = viewport.items(sprite_items)
+        # HUD text redrawn in place keeps its surface, so it's reported apart
+        changed_images = self.ai_game.sb.changed_images
+        viewport.forget(changed_images)
+        static_items = hud_items(self.ai_game)
+        if viewport.scaled:
+            static_items = [
+                (image, image.get_rect(topleft=position))
+                for image, position in viewport.items(static_items)
+            ]
+
+        # Areas to wipe: last frame's sprites and static items that went away
+        dirty = list(self.sprite_rects)
+        for image, rect in self.static_items:
+            if image in changed_images or not self._has_item(static_items, image, rect):
+                dirty.append(rect)
+
+        # Static items that changed or overlap anything being redrawn must be
+        # wiped and drawn again, since text blended over itself smears.
+        touched = dirty + [
+            image.get_rect(topleft=position).clip(screen_rect)
+            for image, position in sprite_items
+        ]
+        redraw = []
+        for image, rect in static_items:
+            if image in changed_images or not self._has_item(self.static_items, image, rect):
+                redraw.append((image, rect))
+        changed = True
+        while changed:
+            changed = False
+            for item in static_items:
+                if item not in redraw and item[1].collidelist(
+                        touched + [rect for _, rect in redraw]) != -1:
+                    redraw.append(item)
+                    changed = True
+        dirty.extend(rect for _, rect in redraw)
+
+        for rect in dirty:
+            self.background.draw(self.screen, rect)
+
+        # Draw the moving sprites, then the static items on top of them
+        self.sprite_rects = self.screen.blits(sprite_items)
+        dirty.extend(self.sprite_rects)
+        self.screen.blits(redraw, doreturn=False)
+        self.static_items = static_items
+        changed_images.clear()
+
+        if full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
+
+    @staticmethod
+    def _has_item(items, image, rect):
+        """Return True if the same image was drawn at the same rect"""
+        for item_image, item_rect in items:
+            if item_image is image and item_rect == rect:
+                return True
+        return False
@@ -0,0 +1,191 @@
+"""
+Record and replay Alien Invasion sessions.
+
+A recording holds the seed and the names of the actions it can hold,
+then each simulation step's dt and actions, then the final score, level
+and a checksum of the game state. It is gzip-compressed; each step takes
+12 bytes before compression.
+
+Usage: python replay.py RECORDING [--speed N]
+Without --speed the session re-runs headless as fast as possible. With it,
+the session is drawn in a window, N steps per frame.
+"""
+import argparse
+import gzip
+import struct
+import zlib
+
+import simulation
+from settings import Settings
+
+MAGIC = b'AIRP'
+VERSION = 3
+# Followed by the action names, newline separated, as many bytes as the
+# last field says
+HEADER = struct.Struct('<4sHQH')
+STEP = struct.Struct('<dI')
+FOOTER = struct.Struct('<IqqI')
+# Each action is one bit of a step's action field
+ACTION_BITS = 32
+
+
+def action_table(settings):
+    """
+    Return every action a step can hold: moving, starting a game, and
+    firing each kind in settings.projectile_kinds
+    :return: tuple of actions, in bit order
+    """
+    actions = [
+        simulation.MOVE_LEFT,
+        simulation.MOVE_RIGHT,
+        simulation.MOVE_UP,
+        simulation.MOVE_DOWN,
+        simulation.PLAY,
+    ]
+    for kind in settings.projectile_kinds.values():
+        if kind['action'] not in actions:
+            actions.append(kind['action'])
+    if len(actions) > ACTION_BITS:
+        raise ValueError(f"A recording holds at most {ACTION_BITS} actions, "
+                         f"not {len(actions)}")
+    return tuple(actions)
+
+
+def encode_actions(actions, table):
+    """Pack a set of actions into the bits of table, refusing any it lacks"""
+    bits = 0
+    for action in actions:
+        if action not in table:
+            raise ValueError(f"Can't record the action {action!r}")
+        bits |= 1 << table.index(action)
+    return bits
+
+
+def decode_actions(bits, table):
+    """Unpack bits into the set of actions of table they hold"""
+    return {action for bit, action in enumerate(table) if bits & (1 << bit)}
+
+
+def checksum(sim):
+    """Return a CRC of the parts of the game state a replay must reproduce"""
+    # The high score is left out, since it comes from the save file
+    state = (
+        sim.stats.score, sim.stats.level, sim.stats.ships_left,
+        len(sim.aliens), sim.ship.rect.x, sim.ship.rect.y,
+        *(len(projectiles) for projectiles in sim.projectiles.values()),
+    )
+    return zlib.crc32(repr(state).encode())
+
+
+class Recorder:
+    """A class to record each step of a session and save it on close"""
+
+    def __init__(self, path, seed, settings):
+        """Initializes an empty recording of the actions settings allow"""
+        self.path = path
+        self.seed = seed
+        self.actions = action_table(settings)
+        self.steps = bytearray()
+        self.step_count = 0
+
+    def record(self, actions, dt):
+        """Add one simulation step"""
+        self.steps += STEP.pack(dt, encode_actions(actions, self.actions))
+        self.step_count += 1
+
+    def close(self, sim):
+        """Write the recording, ending with the state of sim"""
+        with gzip.open(self.path, 'wb') as file:
+            names = '\n'.join(self.actions).encode()
+            file.write(HEADER.pack(MAGIC, VERSION, self.seed, len(names)))
+            file.write(names)
+            file.write(self.steps)
+            file.write(FOOTER.pack(
+                self.step_count, sim.stats.score, sim.stats.level, checksum(sim)
+            ))
+
+
+class Replay:
+    """A class to load a recording and play it back"""
+
+    def __init__(self, path):
+        """Read the whole recording into memory"""
+        with gzip.open(path, 'rb') as file:
+            data = file.read()
+
+        magic, version, self.seed, names_size = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} recording")
+        # The recording's own action table, whatever the settings are now
+        steps_start = HEADER.size + names_size
+        self.actions = tuple(data[HEADER.size:steps_start].decode().split('\n'))
+        (self.step_count, self.score, self.level,
+         self.checksum) = FOOTER.unpack_from(data, len(data) - FOOTER.size)
+        self.steps = [
+            (decode_actions(bits, self.actions), dt)
+            for dt, bits in STEP.iter_unpack(data[steps_start:len(data) - FOOTER.size])
+        ]
+
+    def verify(self, sim):
+        """Return True if sim ended in the recorded state"""
+        return (sim.stats.score == self.score
+                and sim.stats.level == self.level
+                and checksum(sim) == self.checksum)
+
+    def run_headless(self, settings):
+        """Replay every step with nothing drawn and return the simulation"""
+        sim = simulation.Simulation(settings)
+        for actions, dt in self.steps:
+            sim.step(actions, dt)
+        return sim
+
+    def run_rendered(self, settings, speed):
+        """Replay in a window, speed steps per drawn frame"""
+        from alien_invasion import AlienInvasion
+
+        settings.seed = self.seed
+        # A replayed game isn't a new session
+        settings.save_path = None
+        ai = AlienInvasion(settings)
+        ai._finish_loading()
+        steps = iter(self.steps)
+        while True:
+            ai._check_events()
+            for _ in range(speed):
+                step = next(steps, None)
+                if step is None:
+                    return ai.sim
+                # The recording only has the steps that were played, so
+                # replays run straight through the game's pauses
+                actions, dt = step
+                ai.sim.step(actions, dt)
+                ai._handle_sim_events()
+            ai._update_screen()
+            ai.pacer.tick()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('recording')
+    parser.add_argument('--speed', type=int, default=None,
+                        help="Draw the replay, running this many steps per frame")
+    args = parser.parse_args()
+
+    replay = Replay(args.recording)
+    if args.speed:
+        sim = replay.run_rendered(Settings(), args.speed)
+    else:
+        sim = replay.run_headless(Settings())
+
+    print(f"Replayed {replay.step_count} steps: score {sim.stats.score}, "
+          f"level {sim.stats.level}")
+    if replay.verify(sim):
+        print("Final state matches the recording.")
+    else:
+        print(f"Final state differs: recorded score {replay.score}, "
+              f"level {replay.level}")
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
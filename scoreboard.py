@@ -1,4 +1,4 @@
-import pygame.font
+from glyphs import GlyphCache, TextLine
 
 
 class Scoreboard:
@@ -7,13 +7,21 @@ class Scoreboard:
     def __init__(self, ai_game):
         """Initializes scorekeeping attributes"""
         self.screen = ai_game.screen
-        self.screen_rect = self.screen.get_rect()
+        # Laid out on the logical playfield, like every sprite
+        self.screen_rect = ai_game.viewport.rect
         self.settings = ai_game.settings
         self.stats = ai_game.stats
 
         # Font settings for scoring information.
         self.text_color = (0, 255, 0)
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = ai_game.assets.font(self.settings.font_path, self.settings.font_size)
+        # Text is composed from glyphs rendered once, not re-rendered
+        self.glyphs = GlyphCache(self.font, self.text_color)
+        self.score_line = TextLine(self.glyphs)
+        self.high_score_line = TextLine(self.glyphs)
+        self.level_line = TextLine(self.glyphs)
+        # Images redrawn in place since a renderer last looked
+        self.changed_images = set()
 
         # Prepare the initial score image
         self.prep_score()
@@ -24,9 +32,7 @@ class Scoreboard:
         """Turn the score and level into rendered images"""
         rounded_score = round(self.stats.score, -1)
         score_str = "Score: {:,}".format(rounded_score)
-        self.score_image = self.font.render(
-            score_str, True, self.text_color, None
-        )
+        self.score_image = self._render(self.score_line, score_str)
 
         # Display the score at the top right of the screen
         self.score_rect = self.score_image.get_rect()
@@ -37,9 +43,7 @@ class Scoreboard:
         """Turn the high score into a rendered image."""
         high_score = round(self.stats.high_score, -1)
         high_score_str = "High Score: {:,}".format(high_score)
-        self.high_score_image = self.font.render(
-            high_score_str, True, self.text_color, None
-        )
+        self.high_score_image = self._render(self.high_score_line, high_score_str)
 
         # Center the high score at the top of the screen
         self.high_score_rect = self.high_score_image.get_rect()
@@ -49,23 +53,28 @@ class Scoreboard:
     def prep_level(self):
         """Turn the level into a rendered image."""
         level_str = "Level: {}".format(str(self.stats.level))
-        self.level_image = self.font.render(
-            level_str, True, self.text_color, None
-        )
+        self.level_image = self._render(self.level_line, level_str)
 
         # Position the level above the score
         self.level_rect = self.level_image.get_rect()
         self.level_rect.right = self.score_rect.right
         self.level_rect.top = self.score_rect.top - 40
 
-    def check_high_score(self):
-        """Check to see if there's a new high score"""
-        if self.stats.score > self.stats.high_score:
-            self.stats.high_score = self.stats.score
-            self.prep_high_score()
+    def _render(self, line, text):
+        """Bring a line up to date with text and return its image"""
+        if line.render(text):
+            self.changed_images.add(line.image)
+        return line.image
+
+    def items(self):
+        """Return the (image, rect) pairs that make up the scoreboard"""
+        return (
+            (self.score_image, self.score_rect),
+            (self.high_score_image, self.high_score_rect),
+            (self.level_image, self.level_rect),
+        )
 
     def show_score(self):
         """Draw the score to the screen"""
-        self.screen.blit(self.score_image, self.score_rect)
-        self.screen.blit(self.high_score_image, self.high_score_rect)
-        self.screen.blit(self.level_image, self.level_rect)
+        for image, rect in self.items():
+            self.screen.blit(image, rect)
@@ -7,43 +7,230 @@ class Settings:
         """Initialize the game's settings"""
         # ------------ DEBUG ---------------------
         self.DEBUG = False
+        # Time each part of the frame and show p50/p95/p99 on screen
+        self.profile = False
+        # Number of recent frames the percentiles cover
+        self.profile_window = 600
+        # Write the timings here on exit; .csv for CSV, anything else for JSON
+        self.profile_output = None
+
+        # ------------ Replay settings ------------
+        # Seed for the game's random numbers; None picks a new one each run
+        self.seed = None
+        # Record every step's input and dt to this file. See replay.py
+        self.record_path = None
+
+        # ------------ Save settings ------------
+        # SQLite file keeping the high score and a record of every game;
+        # None saves nothing
+        self.save_path = 'alien_invasion.sqlite3'
 
         # ------------ Screen settings ------------
         self.full_screen = False
-        # Screen width and height if self.full_screen is False.
-        # Otherwise, these settings are ignored. See alien_invasion.__init__()
+        # Size of the playfield, in the logical pixels the game is played in.
+        # The window or full screen shows it scaled to fit, so gameplay is
+        # the same at every resolution. See viewport.py
         self.screen_width = 1920
         self.screen_height = 1080
+        # Window size if self.full_screen is False; None matches the playfield
+        self.window_size = None
+        # Keep sprites scaled for the display in this folder, so later runs
+        # at the same size load them instead of scaling again. Delete it
+        # after changing an image.
+        self.scale_cache_dir = None
         self.bg_color = (0, 0, 0)
         self.bg_image = 'images/SpaceShooterRedux/Backgrounds/darkPurple.png'
+        self.show_bg_image = False
+        # Layers scrolled over the background as (image, speed) pairs, e.g.
+        # [('images/Stars-Nebulae/Stars.png', 0.5),
+        #  ('images/Stars-Nebulae/Nebula1.png', 1.0)]
+        self.parallax_layers = []
+        # 'full' redraws and flips the whole screen every frame.
+        # 'dirty' redraws only the rects that changed. See renderer.py
+        self.render_mode = 'full'
+
+        # ------------ Frame pacing settings ------------
+        # Length of each simulation step, in frames at 60 FPS. The simulation
+        # runs in steps of exactly this length whatever the frame rate;
+        # None steps once per frame by however long the frame took instead.
+        self.sim_step = 1.0
+        # Most steps run in one frame; time owed beyond this is dropped
+        self.max_steps_per_frame = 5
+        # Draw sprites between their last two steps, so motion stays smooth
+        # when the frame rate and the step rate differ
+        self.interpolate = True
+        # Frame rate cap while playing; 0 runs as fast as possible
+        self.max_frame_rate = 60
+        # Wait for the display's refresh instead of the cap above
+        self.vsync = False
+        # Frame rate on the menu, where nothing moves
+        self.idle_frame_rate = 15
+
+        # ------------ Font settings ------------
+        # Bundled fonts are loaded straight from their files, which is much
+        # faster than searching the system's fonts
+        self.font_path = 'images/SpaceShooterRedux/Bonus/kenvector_future.ttf'
+        self.font_size = 24
+        self.small_font_path = 'images/SpaceShooterRedux/Bonus/kenvector_future_thin.ttf'
+        self.small_font_size = 14
+
+        # ------------ Sound settings ------------
+        # Every .ogg in this folder is loaded in the background at startup
+        self.sound_dir = 'images/SpaceShooterRedux/Bonus'
+        self.sound_volume = 0.5
+        # Mixer channels shared by every effect
+        self.sound_channels = 8
+        # Effect -> (file in sound_dir, most voices at once, priority).
+        # An effect can take the channel of a lower priority one.
+        self.sound_effects = {
+            'fire': ('sfx_laser1.ogg', 2, 1),
+            'super_fire': ('sfx_laser2.ogg', 2, 1),
+            'hit': ('sfx_zap.ogg', 3, 2),
+            'ship_hit': ('sfx_shieldDown.ogg', 1, 3),
+            'game_over': ('sfx_lose.ogg', 1, 4),
+        }
+
+        # ------------ Control settings ------------
+        # Key name (as pygame.key.key_code() reads it) -> action. Movement
+        # lasts while the key is held; holding a firing key keeps firing.
+        # See controls.py
+        self.key_bindings = {
+            'right': 'move_right',
+            'd': 'move_right',
+            'left': 'move_left',
+            'a': 'move_left',
+            'up': 'move_up',
+            'w': 'move_up',
+            'down': 'move_down',
+            's': 'move_down',
+            'space': 'fire',
+            '[0]': 'super_fire',
+            'q': 'quit',
+        }
+        # A held firing key fires as often as the kind's inventory can keep
+        # up with over its flight up the screen, but never more often than
+        # this many frames at 60 FPS
+        self.autofire_min_interval = 4.0
+
+        # ------------ Sprite sheet settings ------------
+        # Image settings below may name a SubTexture of this sheet
+        # (e.g. 'enemyRed3.png') instead of a path to a separate PNG.
+        self.atlas_xml = 'images/SpaceShooterRedux/Spritesheet/sheet.xml'
 
         # ------------ Ship settings ------------
-        self.ship_image = 'images/SpaceShooterRedux/PNG/playerShip1_blue.png'
+        self.ship_image = 'playerShip1_blue.png'
         self.ship_limit = 3
 
-        # ------------ Bullet settings ------------
-        self.bullet_width = 10
-        self.bullet_height = 3
-        self.bullet_color = (0, 255, 0)
-        self.bullet_image = 'images/SpaceShooterRedux/PNG/Lasers/laserGreen10.png'
-        self.bullet_inventory = 3
-
-        # ------------ Super bullet settings ------------
-        self.super_bullet_speed = 4.0
-        self.super_bullet_width = 60
-        self.super_bullet_height = 15
-        self.super_bullet_image = 'images/SpaceShooterRedux/PNG/Lasers/laserRed14.png'
-        self.super_bullet_inventory = 99
+        # ------------ Projectile settings ------------
+        # Every kind of projectile the ship fires. Each has an image (turned
+        # by rotation degrees), a hit box size, a starting speed, how many
+        # can be in flight at once, the input action that fires it, and the
+        # sound effect it makes. See projectile.py
+        self.projectile_kinds = {
+            'bullet': {
+                'image': 'laserGreen10.png',
+                'size': (10, 3),
+                'speed': 4.0,
+                'inventory': 3,
+                'action': 'fire',
+                'sound': 'fire',
+            },
+            'super_bullet': {
+                'image': 'laserRed14.png',
+                'rotation': 90.0,
+                'size': (60, 15),
+                'speed': 8.0,
+                'inventory': 99,
+                'action': 'super_fire',
+                'sound': 'super_fire',
+            },
+        }
 
         # ------------ Alien settings ------------
-        self.alien_image = 'images/SpaceShooterRedux/PNG/Enemies/enemyRed3.png'
+        # Images of each kind of alien, by the letter formations use for
+        # it. The 'grid' formation is all 'X'; other kinds are centered in
+        # a cell the size of an 'X'.
+        self.alien_kinds = {
+            'X': 'enemyRed3.png',
+            'B': 'enemyBlack1.png',
+            'G': 'enemyGreen2.png',
+            'M': 'meteorBrown_big1.png',
+        }
         self.fleet_drop_speed = 5
         self.fleet_drop_multiplier = 1.5
+        # 'grid' fills the screen with rows of aliens. Any other name is
+        # looked up in self.formations. See formation.py
+        self.fleet_formation = 'grid'
+        # Formations as rows of text: each letter of alien_kinds is an alien
+        # of that kind, anything else a gap
+        self.formations = {
+            'wedge': [
+                'XXXXXXXX',
+                '.XXXXXX.',
+                '..XXXX..',
+                '...XX...',
+            ],
+            'checkerboard': [
+                'X.X.X.X.',
+                '.X.X.X.X',
+                'X.X.X.X.',
+                '.X.X.X.X',
+            ],
+            'escort': [
+                'BBBBBBBB',
+                'GXGXGXGX',
+                'M.M..M.M',
+            ],
+        }
 
         # ------------ Effects settings ------------
-        self.star1 = 'images/SpaceShooterRedux/PNG/Effects/star1.png'
-        self.star2 = 'images/SpaceShooterRedux/PNG/Effects/star2.png'
-        self.star3 = 'images/SpaceShooterRedux/PNG/Effects/star3.png'
+        self.star1 = 'star1.png'
+        self.star2 = 'star2.png'
+        self.star3 = 'star3.png'
+        self.star_images = (self.star1, self.star2, self.star3)
+
+        # ------------ Particle settings ------------
+        # Most particles alive at once, which bounds what they cost a frame.
+        # New particles replace the oldest. See particles.py
+        self.particle_budget = 512
+        # Effect -> bursts of particles flying out from where it happens.
+        # Each burst has a count per effect, a speed range in pixels per
+        # frame, a life in frames at 60 FPS, and images shown in turn over
+        # that life, scaled to scale if given.
+        self.particle_effects = {
+            # Each alien destroyed
+            'alien': [
+                {
+                    'count': 6,
+                    'speed': (1.0, 3.0),
+                    'life': 20,
+                    'images': (self.star1, self.star2, self.star3),
+                    'scale': (12, 12),
+                },
+            ],
+            # The ship being hit: its wreck, and flames flying out of it
+            'ship': [
+                {
+                    'count': 1,
+                    'speed': (0.0, 0.0),
+                    'life': 30,
+                    'images': ('playerShip1_damage1.png', 'playerShip1_damage2.png',
+                               'playerShip1_damage3.png'),
+                },
+                {
+                    'count': 16,
+                    'speed': (1.0, 4.0),
+                    'life': 30,
+                    'images': tuple(f'fire{number:02}.png' for number in range(0, 20, 4)),
+                },
+            ],
+        }
+
+        # ------------ Game flow settings ------------
+        # Pauses between parts of the game, in frames at 60 FPS
+        self.respawn_pause = 30
+        self.level_pause = 30
+        self.game_over_pause = 60
 
         # ------------ Leveling settings ------------
         self.speedup_scale = 1.2
@@ -57,8 +244,10 @@ class Settings:
         """Initializes settings that change throughout the game."""
         self.ship_speed_x = 3.5
         self.ship_speed_y = -3.0
-        self.bullet_speed = 4.0
-        self.super_bullet_speed = 8.0
+        # Projectile kind -> speed, starting from projectile_kinds
+        self.projectile_speeds = {
+            name: kind['speed'] for name, kind in self.projectile_kinds.items()
+        }
         self.alien_speed = 2.0
         # fleet_direction of 1 represents right; -1 represents left
         self.fleet_direction = 1
@@ -70,7 +259,7 @@ class Settings:
         """Increase speed settings"""
         self.ship_speed_x *= self.speedup_scale
         self.ship_speed_y *= self.speedup_scale
-        self.bullet_speed *= self.speedup_scale
-        self.super_bullet_speed *= self.speedup_scale
+        for name in self.projectile_speeds:
+            self.projectile_speeds[name] *= self.speedup_scale
         self.alien_speed *= self.speedup_scale
         self.alien_points = int(self.alien_points * self.score_scale)
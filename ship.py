@@ -1,4 +1,4 @@
-import pygame
+from pacing import interpolate
 
 
 class Ship:
@@ -11,7 +11,7 @@ class Ship:
         self.screen_rect = ai_game.screen.get_rect()
 
         # Load the ship image and get its rect.
-        self.image = pygame.image.load(self.settings.ship_image)
+        self.image = ai_game.assets.image(self.settings.ship_image)
         self.rect = self.image.get_rect()
         # Start each new ship at the bottom center of the screen
         self.rect.midbottom = self.screen_rect.midbottom
@@ -19,6 +19,9 @@ class Ship:
         # Store a decimal value for the ship's horizontal position
         self.x = float(self.rect.x)
         self.y = float(self.rect.y)
+        # Position before the last update, to draw in between
+        self.prev_x = self.x
+        self.prev_y = self.y
 
         # Movement flag
         self.moving_right = False
@@ -28,6 +31,8 @@ class Ship:
 
     def update(self, dt):
         """Update the ship's position based on the movement flag"""
+        self.prev_x = self.x
+        self.prev_y = self.y
         # ---------- Right and Left Movement ----------
         if self.moving_right and self.rect.right < self.screen_rect.right:
             self.x += self.settings.ship_speed_x * dt
@@ -47,8 +52,17 @@ class Ship:
         """Draw the ship at its current location"""
         self.screen.blit(self.image, self.rect)
 
+    def draw_position(self, alpha):
+        """Return where to draw the ship, alpha of the way through its last move"""
+        if alpha >= 1.0:
+            return self.rect.topleft
+        return (interpolate(self.prev_x, self.x, alpha),
+                interpolate(self.prev_y, self.y, alpha))
+
     def center_ship(self):
         """Center the ship on the screen"""
         self.rect.midbottom = self.screen_rect.midbottom
         self.x = float(self.rect.x)
         self.y = float(self.rect.y)
+        self.prev_x = self.x
+        self.prev_y = self.y
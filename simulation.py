@@ -0,0 +1,250 @@
+import pygame
+
+from assets import AssetCache
+from fleet import Fleet
+from formation import Formations
+from pool import ProjectilePool
+from projectile import ProjectileKind
+from profiler import NullProfiler
+from game_stats import GameStats
+from ship import Ship
+
+# ------------ Input actions ------------
+# Held actions stay in the stream for as long as the player holds them.
+MOVE_LEFT = 'move_left'
+MOVE_RIGHT = 'move_right'
+MOVE_UP = 'move_up'
+MOVE_DOWN = 'move_down'
+# Triggered actions appear only in the step they happen.
+FIRE = 'fire'
+SUPER_FIRE = 'super_fire'
+PLAY = 'play'
+
+# ------------ Simulation events ------------
+# Collected in Simulation.events for whoever presents the game.
+GAME_STARTED = 'game_started'
+SCORE_CHANGED = 'score_changed'
+HIGH_SCORE_CHANGED = 'high_score_changed'
+LEVEL_CHANGED = 'level_changed'
+SHIP_HIT = 'ship_hit'
+ALIENS_HIT = 'aliens_hit'
+GAME_OVER = 'game_over'
+# Firing adds '<kind>_fired' for the kind of projectile, e.g. 'bullet_fired'
+# Destroyed aliens and ship hits are also collected, with where they
+# happened, in Simulation.explosions as (effect, centers) pairs
+ALIEN_EXPLOSION = 'alien'
+SHIP_EXPLOSION = 'ship'
+
+
+class Simulation:
+    """A class to run the rules of the game without a window or SDL events"""
+
+    def __init__(self, settings, screen=None, assets=None, profiler=None):
+        """
+        Initializes the ship, projectiles, fleet and stats
+        :param settings: Settings for this game
+        :param screen: Surface the sprites live on. Headless runs leave this
+            out and get an off-screen surface the size of the screen settings.
+        :param assets: AssetCache to share with a renderer, if any
+        :param profiler: FrameProfiler to time each part of a step with
+        :return: None
+        """
+        self.settings = settings
+        self.profiler = profiler or NullProfiler()
+        if screen is None:
+            screen = pygame.Surface(
+                (self.settings.screen_width, self.settings.screen_height)
+            )
+        self.screen = screen
+        self.assets = assets or AssetCache(self)
+
+        self.stats = GameStats(self)
+        self.ship = Ship(self)
+        # One pool per kind of projectile, holding every projectile its
+        # inventory allows, created up front
+        self.projectiles = {
+            name: ProjectilePool(self, ProjectileKind(self, name, spec))
+            for name, spec in self.settings.projectile_kinds.items()
+        }
+        self.aliens = Fleet(self)
+        self.formations = Formations(self)
+        self._create_fleet()
+
+        # Things that happened since the presenter last emptied this list
+        self.events = []
+        # Explosions since the presenter last emptied this list
+        self.explosions = []
+
+    def start_game(self):
+        """Reset settings, stats and entities and start playing"""
+        # Reset game settings
+        self.settings.initialize_dynamic_settings()
+        # Reset the game stats
+        self.stats.reset_stats()
+        self.stats.game_active = True
+        self.events.append(GAME_STARTED)
+        self.events.append(SCORE_CHANGED)
+        self.events.append(LEVEL_CHANGED)
+
+        self._reset_entities()
+
+    def step(self, actions, dt=1.0):
+        """
+        Advance the game by one step
+        :param actions: Actions held or triggered during this step
+        :param dt: Length of the step, in frames at 60 FPS
+        :return: None
+        """
+        if PLAY in actions and not self.stats.game_active:
+            self.start_game()
+        if not self.stats.game_active:
+            return
+
+        self.ship.moving_left = MOVE_LEFT in actions
+        self.ship.moving_right = MOVE_RIGHT in actions
+        self.ship.moving_up = MOVE_UP in actions
+        self.ship.moving_down = MOVE_DOWN in actions
+        for projectiles in self.projectiles.values():
+            if projectiles.kind.action in actions:
+                self._fire(projectiles)
+
+        # Update the ship
+        with self.profiler.section('ship'):
+            self.ship.update(dt)
+        # Update every kind of projectile, each timed on its own
+        for projectiles in self.projectiles.values():
+            with self.profiler.section(projectiles.kind.name):
+                self._update_projectiles(projectiles, dt)
+        # Update the aliens
+        with self.profiler.section('aliens'):
+            self._update_aliens(dt)
+
+    def _fire(self, projectiles):
+        """Fire a projectile if its inventory has one left."""
+        if projectiles.fire():
+            self.stats.shots_fired += 1
+            self.events.append(projectiles.kind.fired_event)
+
+    def _update_projectiles(self, projectiles, dt):
+        # Move the projectiles, then recycle any that left the screen. Hits
+        # are checked in between, in case one passed an alien on its way out.
+        projectiles.update(dt)
+        self._check_projectile_alien_collisions(projectiles)
+        projectiles.cull()
+
+    def _check_projectile_alien_collisions(self, projectiles):
+        # Check for any projectiles that have hit aliens
+        # if so, get rid of the projectile and the alien
+        aliens_hit = self._collide_with_fleet(projectiles)
+        if aliens_hit:
+            self.stats.score += self.settings.alien_points * aliens_hit
+            self.events.append(SCORE_CHANGED)
+            self._check_high_score()
+
+        if not self.aliens:
+            self._start_next_level()
+
+    def _collide_with_fleet(self, projectiles):
+        """
+        Remove projectiles that hit aliens, and the aliens they hit, the same
+        way groupcollide(projectiles, aliens, True, True) would. Each
+        projectile is tested along its whole move, so fast ones can't skip
+        over an alien between steps.
+        :return: The number of aliens hit
+        """
+        hits = self.aliens.collide_projectiles(projectiles)
+        projectiles.release([index for index, _ in hits])
+        self.stats.shots_hit += len(hits)
+        if not hits:
+            return 0
+        killed = [index for _, indices in hits for index in indices]
+        self.events.append(ALIENS_HIT)
+        self.explosions.append((ALIEN_EXPLOSION, self.aliens.centers(killed)))
+        return len(killed)
+
+    def _check_high_score(self):
+        """Check to see if there's a new high score"""
+        if self.stats.score > self.stats.high_score:
+            self.stats.high_score = self.stats.score
+            self.events.append(HIGH_SCORE_CHANGED)
+
+    def _start_next_level(self):
+        """Bring in a new, faster fleet once the current one is destroyed"""
+        self._reset_entities()
+        self.settings.increase_speed()
+
+        # Increase level
+        self.stats.level += 1
+        self.events.append(LEVEL_CHANGED)
+
+    def _create_fleet(self):
+        """Create the fleet of aliens."""
+        # The layout is worked out on the first fleet and reused after that
+        self.aliens.reset(self.formations.layout(self.settings.fleet_formation))
+
+    def _check_fleet_edges(self):
+        """Respond appropriately if any aliens have reached an edge."""
+        if self.aliens.check_edges():
+            self._change_fleet_direction()
+
+    def _change_fleet_direction(self):
+        """Drop the entire fleet and change the fleet's direction."""
+        self.aliens.drop(self.settings.fleet_drop_speed)
+
+        self.settings.fleet_direction *= -1
+
+    def _update_aliens(self, dt):
+        """
+        Check if the fleet is at an edge,
+            then update the positions of all aliens in the fleet
+        :return: None
+        """
+        self._check_fleet_edges()
+        self.aliens.update(dt)
+
+        # Look for alien - player ship collisions
+        if self.aliens.collide_any(self.ship.rect):
+            # The ship is only hit once a step, even if an alien reached
+            # the bottom too
+            self._ship_hit()
+            return
+
+        # Look for aliens hitting the bottom of the screen
+        self._check_aliens_bottom()
+
+    def _check_aliens_bottom(self):
+        """Check to see if any aliens have reached the bottom of the screen"""
+        if self.aliens.check_bottom():
+            # Treat this the same as the alien hitting the player ship
+            self._ship_hit()
+
+    def _ship_hit(self):
+        """Respond to the ship being hit by an alien"""
+        self.explosions.append((SHIP_EXPLOSION, [self.ship.rect.center]))
+        if self.stats.ships_left > 0:
+            # Decrement ships_left
+            self.stats.ships_left -= 1
+
+            self._reset_entities()
+            self.events.append(SHIP_HIT)
+        else:
+            self.stats.game_active = False
+            self.events.append(GAME_OVER)
+
+    def _reset_entities(self):
+        # Get rid of any remaining aliens and bullets
+        self.aliens.empty()
+        for projectiles in self.projectiles.values():
+            projectiles.empty()
+        if self.settings.DEBUG:
+            print(f"""
+============================ DEBUG: Entity Speeds ============================
+                       Ship X Speed : {self.settings.ship_speed_x}
+                       Ship Y Speed : {self.settings.ship_speed_y}
+                  Projectile Speeds : {self.settings.projectile_speeds}
+                        Alien Speed : {self.settings.alien_speed}
+                    """)
+
+        # Create a new fleet and center the ship
+        self._create_fleet()
+        self.ship.center_ship()
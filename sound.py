@@ -0,0 +1,95 @@
+import itertools
+
+import pygame
+
+import simulation
+
+# The effect each simulation event plays. Firing a projectile plays the
+# sound of its kind in settings.projectile_kinds.
+EVENT_EFFECTS = {
+    simulation.ALIENS_HIT: 'hit',
+    simulation.SHIP_HIT: 'ship_hit',
+    simulation.GAME_OVER: 'game_over',
+}
+
+
+class SoundEngine:
+    """A class to play effects through a fixed pool of mixer channels"""
+
+    def __init__(self, ai_game):
+        """Initializes the engine; no sound plays until start() finds a mixer"""
+        self.settings = ai_game.settings
+        self.assets = ai_game.assets
+        self.channels = []
+        # Channel index -> (effect, priority, order) of what it last played
+        self.voices = {}
+        # Increases with every play, so the oldest voice can be found
+        self.order = itertools.count()
+        self.event_effects = dict(EVENT_EFFECTS)
+        for name, kind in self.settings.projectile_kinds.items():
+            self.event_effects[f'{name}_fired'] = kind['sound']
+
+    def start(self):
+        """Reserve the channel pool, once the assets have finished loading"""
+        if not pygame.mixer.get_init():
+            return
+        pygame.mixer.set_num_channels(self.settings.sound_channels)
+        self.channels = [
+            pygame.mixer.Channel(index) for index in range(self.settings.sound_channels)
+        ]
+        for effect in self.settings.sound_effects.values():
+            sound = self.assets.sound(effect[0])
+            if sound is not None:
+                sound.set_volume(self.settings.sound_volume)
+
+    def play_events(self, events):
+        """Play the effect of each event, once however often it happened"""
+        effects = dict.fromkeys(
+            self.event_effects[event] for event in events if event in self.event_effects
+        )
+        for effect in effects:
+            self.play(effect)
+
+    def play(self, effect):
+        """
+        Play an effect, unless its voices are used up and nothing quieter
+        can make way for it
+        :param effect: A key of settings.sound_effects
+        :return: None
+        """
+        if not self.channels:
+            return
+        name, max_voices, priority = self.settings.sound_effects[effect]
+        sound = self.assets.sound(name)
+        if sound is None:
+            return
+
+        # Forget voices whose channels have gone quiet
+        for index in list(self.voices):
+            if not self.channels[index].get_busy():
+                del self.voices[index]
+
+        same_effect = [index for index, voice in self.voices.items() if voice[0] == effect]
+        if len(same_effect) >= max_voices:
+            # Restart this effect's oldest voice rather than add another
+            index = min(same_effect, key=lambda index: self.voices[index][2])
+        else:
+            index = self._free_channel(priority)
+            if index is None:
+                return
+
+        self.channels[index].play(sound)
+        self.voices[index] = (effect, priority, next(self.order))
+
+    def _free_channel(self, priority):
+        """
+        Return an idle channel, or else the one playing the least important,
+        oldest voice below priority. None if nothing can be stolen.
+        """
+        for index in range(len(self.channels)):
+            if index not in self.voices:
+                return index
+        lower = [index for index, voice in self.voices.items() if voice[1] < priority]
+        if not lower:
+            return None
+        return min(lower, key=lambda index: (self.voices[index][1], self.voices[index][2]))
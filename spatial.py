@@ -0,0 +1,50 @@
+class SpatialGrid:
+    """A class to find the rects near an area without testing all of them"""
+
+    def __init__(self, cell_size):
+        """Initializes an empty grid of square cells"""
+        self.cell_size = cell_size
+        # Map (column, row) to the indices of the rects touching that cell
+        self.cells = {}
+        # Cells each index was put in, so it can be taken out again
+        self.cells_of = {}
+
+    def build(self, lefts, tops, rights, bottoms):
+        """
+        Replace the grid's contents
+        :param lefts, tops, rights, bottoms: Edges of each rect, by index
+        :return: None
+        """
+        self.cells.clear()
+        self.cells_of.clear()
+        for index, bounds in enumerate(zip(lefts, tops, rights, bottoms)):
+            self.cells_of[index] = self._cells(*bounds)
+            for cell in self.cells_of[index]:
+                self.cells.setdefault(cell, set()).add(index)
+
+    def load(self, other):
+        """Replace the grid's contents with a copy of another grid's"""
+        self.cells = {cell: set(indices) for cell, indices in other.cells.items()}
+        # The lists of cells are never changed, only dropped, so share them
+        self.cells_of = dict(other.cells_of)
+
+    def remove(self, index):
+        """Take the rect at index out of the grid"""
+        for cell in self.cells_of.pop(index, ()):
+            self.cells[cell].discard(index)
+
+    def query(self, left, top, right, bottom):
+        """Return the indices of rects in the cells the given area touches"""
+        found = set()
+        for cell in self._cells(left, top, right, bottom):
+            found.update(self.cells.get(cell, ()))
+        return found
+
+    def _cells(self, left, top, right, bottom):
+        """Return the (column, row) of every cell an area touches"""
+        size = self.cell_size
+        return [
+            (column, row)
+            for column in range(left // size, (right - 1) // size + 1)
+            for row in range(top // size, (bottom - 1) // size + 1)
+        ]
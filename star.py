@@ -1,6 +1,3 @@
-from random import randint
-
-import pygame.image
 from pygame.sprite import Sprite
 
 
@@ -13,20 +10,20 @@ class Star(Sprite):
         self.screen = ai_game.screen
         self.settings = ai_game.settings
 
-        random_int = randint(1, 3)
+        random_int = ai_game.rng.randint(1, 3)
         match random_int:
             case 1:
-                self.image = pygame.image.load(self.settings.star1)
+                self.image = ai_game.assets.image(self.settings.star1)
             case 2:
-                self.image = pygame.image.load(self.settings.star2)
+                self.image = ai_game.assets.image(self.settings.star2)
             case 3:
-                self.image = pygame.image.load(self.settings.star3)
+                self.image = ai_game.assets.image(self.settings.star3)
 
         self.rect = self.image.get_rect()
 
         # Start a star in a random location on the screen
-        random_x = randint(0, self.settings.screen_width)
-        random_y = randint(0, self.settings.screen_height)
+        random_x = ai_game.rng.randint(0, self.settings.screen_width)
+        random_y = ai_game.rng.randint(0, self.settings.screen_height)
         self.rect.x = random_x
         self.rect.y = random_y
 
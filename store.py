@@ -0,0 +1,100 @@
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+
+import pygame
+
+# Posted to the event queue, with a score attribute, once the saved high
+# score has been read
+HIGH_SCORE_LOADED = pygame.event.custom_type()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    started TEXT,
+    ended TEXT,
+    score INTEGER,
+    level INTEGER,
+    shots_fired INTEGER,
+    shots_hit INTEGER,
+    hit_ratio REAL,
+    frames INTEGER,
+    frame_mean_ms REAL,
+    frame_p50_ms REAL,
+    frame_p95_ms REAL,
+    frame_p99_ms REAL
+)
+"""
+
+
+def summarize_frames(frame_times):
+    """
+    Return the mean, p50, p95 and p99 of a game's frame times
+    :param frame_times: Frame times in milliseconds
+    """
+    if not frame_times:
+        return None, None, None, None
+    samples = sorted(frame_times)
+    last = len(samples) - 1
+    return (sum(samples) / len(samples),) + tuple(
+        samples[round(last * percent)] for percent in (0.50, 0.95, 0.99)
+    )
+
+
+class ScoreStore:
+    """A class to save high scores and game sessions without blocking the game"""
+
+    def __init__(self, path):
+        """
+        Start the writer thread, which reads the high score first
+        :param path: SQLite database file, created if it doesn't exist
+        """
+        self.path = path
+        # Jobs for the writer thread; None tells it to finish
+        self.jobs = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name='ScoreStore', daemon=True)
+        self.thread.start()
+
+    def save_session(self, started, stats, frame_times):
+        """
+        Queue a finished game to be saved
+        :param started: datetime the game started
+        :param stats: GameStats at the end of the game
+        :param frame_times: Frame times of the game, in milliseconds
+        """
+        hit_ratio = stats.shots_hit / stats.shots_fired if stats.shots_fired else None
+        row = (
+            started.isoformat(timespec='seconds'),
+            datetime.now().isoformat(timespec='seconds'),
+            stats.score, stats.level, stats.shots_fired, stats.shots_hit, hit_ratio,
+            len(frame_times), *summarize_frames(frame_times),
+        )
+        self.jobs.put(lambda connection: connection.execute(
+            "INSERT INTO sessions (started, ended, score, level, shots_fired,"
+            " shots_hit, hit_ratio, frames, frame_mean_ms, frame_p50_ms,"
+            " frame_p95_ms, frame_p99_ms) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            row,
+        ))
+
+    def close(self):
+        """Finish the queued writes and stop the writer thread"""
+        self.jobs.put(None)
+        self.thread.join()
+
+    def _run(self):
+        """Own the database connection and run jobs until told to stop"""
+        connection = sqlite3.connect(self.path)
+        with connection:
+            connection.execute(SCHEMA)
+        high_score = connection.execute("SELECT MAX(score) FROM sessions").fetchone()[0]
+        if pygame.display.get_init():
+            pygame.event.post(pygame.event.Event(HIGH_SCORE_LOADED, score=high_score or 0))
+
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            with connection:
+                job(connection)
+        connection.close()
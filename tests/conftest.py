@@ -0,0 +1,21 @@
+"""
+Setup shared by every test. Run from the repository root with
+python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def in_repository_root(monkeypatch):
+    # Image paths in the settings are relative to the repository root.
+    # monkeypatch changes back to the previous directory after each test.
+    monkeypatch.chdir(ROOT)
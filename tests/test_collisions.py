@@ -0,0 +1,86 @@
+"""
+Pin down whether fast projectiles hit or pass through the fleet.
+"""
+import unittest
+
+from settings import Settings
+from simulation import Simulation, FIRE, PLAY
+
+SPEEDS = (4, 50, 200, 1000, 5000, 1e6)
+DTS = (0.25, 1.0, 4.0)
+# Left edge of the aliens' cells, away from both edges of the screen
+ALIEN_X = 900
+
+
+def fire_at(ys, speed, dt, swept=True):
+    """
+    Fire one bullet at standing aliens and step until it hits or is gone
+    :param ys: Top edges of the aliens' cells, in one column
+    :param swept: False tests only where the bullet ends each step
+    :return: The simulation
+    """
+    sim = Simulation(Settings())
+    sim.step({PLAY})
+    sim.settings.alien_speed = 0.0
+    sim.settings.projectile_speeds['bullet'] = speed
+    sim.aliens.fill([ALIEN_X] * len(ys), ys)
+
+    # Put the ship under the column
+    sim.ship.rect.centerx = ALIEN_X + sim.aliens.alien_width // 2
+    sim.ship.x = float(sim.ship.rect.x)
+    bullets = sim.projectiles['bullet']
+    if not swept:
+        update = bullets.update
+
+        def update_without_sweep(dt):
+            update(dt)
+            for bullet in bullets:
+                bullet.prev_rect.update(bullet.rect)
+        bullets.update = update_without_sweep
+
+    sim.step({FIRE}, 0.0)
+    while bullets and sim.stats.shots_hit == 0:
+        sim.step(set(), dt)
+    return sim
+
+
+class SweptCollisionTest(unittest.TestCase):
+    """Projectiles are tested along their whole move against the fleet"""
+
+    def test_hits_at_any_speed(self):
+        for speed in SPEEDS:
+            for dt in DTS:
+                with self.subTest(speed=speed, dt=dt):
+                    sim = fire_at([300], speed, dt)
+                    self.assertEqual(sim.stats.shots_hit, 1)
+
+    def test_hits_only_the_first_alien_in_its_path(self):
+        for speed in SPEEDS:
+            for dt in DTS:
+                with self.subTest(speed=speed, dt=dt):
+                    sim = fire_at([100, 400], speed, dt)
+                    # The lower alien is hit, the one above it survives
+                    self.assertEqual(sim.aliens.alive.tolist(), [True, False])
+
+    def test_unswept_bullet_tunnels(self):
+        # The same shot tested only where it ends each step passes through
+        sim = fire_at([300], 1000, 1.0, swept=False)
+        self.assertEqual(sim.stats.shots_hit, 0)
+        self.assertEqual(len(sim.aliens), 1)
+
+
+class ShipHitTest(unittest.TestCase):
+    """The ship is hit at most once a step"""
+
+    def test_last_ship_hit_at_the_bottom_ends_the_game_once(self):
+        sim = Simulation(Settings())
+        sim.step({PLAY})
+        sim.stats.ships_left = 0
+        # An alien on the ship and on the bottom of the screen at once
+        sim.aliens.fill(
+            [sim.ship.rect.x], [sim.settings.screen_height - sim.aliens.alien_height]
+        )
+        sim.events.clear()
+        sim.step(set(), 0.0)
+        self.assertEqual(sim.events, ['game_over'])
+        self.assertEqual(len(sim.explosions), 1)
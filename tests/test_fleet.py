@@ -0,0 +1,99 @@
+"""
+Check the fleet's grid lookup against pygame's own sprite collisions.
+"""
+import random
+import unittest
+
+import pygame
+
+from settings import Settings
+from simulation import Simulation, PLAY
+
+
+class Shot:
+    """A projectile standing still, so only where it is counts"""
+
+    def __init__(self, rect):
+        self.rect = rect
+        self.prev_rect = rect.copy()
+
+
+def moved_fleet():
+    """Return a full fleet that has moved by fractions of a pixel and dropped"""
+    sim = Simulation(Settings())
+    sim.step({PLAY})
+    aliens = sim.aliens
+    # Far enough from where the grid was built to cross into other cells
+    for _ in range(6):
+        for _ in range(7):
+            aliens.update(0.37)
+        aliens.drop(7.3)
+    aliens.drop(0.3)
+    # Leave some gaps
+    aliens.kill(list(range(0, len(aliens.alive), 5)))
+    return aliens
+
+
+def alien_sprites(aliens):
+    """Return a sprite in a group for each living alien, by its index"""
+    sprites = {}
+    for index in aliens.alive.nonzero()[0].tolist():
+        sprite = pygame.sprite.Sprite()
+        sprite.rect = pygame.Rect(
+            int(aliens.rect_x[index]), int(aliens.rect_y[index]),
+            int(aliens.width[index]), int(aliens.height[index]),
+        )
+        sprites[sprite] = index
+    return sprites
+
+
+def random_rects(aliens, count, seed):
+    """Return rects of assorted sizes scattered over and around the fleet"""
+    rng = random.Random(seed)
+    left = int(aliens.rect_x[aliens.alive].min()) - 20
+    right = int(aliens.rect_x[aliens.alive].max()) + 100
+    top = int(aliens.rect_y[aliens.alive].min()) - 20
+    bottom = int(aliens.rect_y[aliens.alive].max()) + 100
+    return [
+        pygame.Rect(rng.randint(left, right), rng.randint(top, bottom),
+                    rng.randint(1, 60), rng.randint(1, 60))
+        for _ in range(count)
+    ]
+
+
+class GroupCollideTest(unittest.TestCase):
+    """The fleet finds the same hits pygame.sprite does"""
+
+    def test_collide_projectiles_matches_groupcollide(self):
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                aliens = moved_fleet()
+                sprites = alien_sprites(aliens)
+                shots = [Shot(rect) for rect in random_rects(aliens, 300, seed)]
+                # Shot sprite -> its index, in the order they're tested
+                shot_sprites = {}
+                for index, shot in enumerate(shots):
+                    sprite = pygame.sprite.Sprite()
+                    sprite.rect = shot.rect
+                    shot_sprites[sprite] = index
+
+                collided = pygame.sprite.groupcollide(
+                    pygame.sprite.Group(list(shot_sprites)), pygame.sprite.Group(list(sprites)),
+                    True, True,
+                )
+                expected = {
+                    shot_sprites[shot]: sorted(sprites[alien] for alien in hit)
+                    for shot, hit in collided.items()
+                }
+                hits = aliens.collide_projectiles(shots)
+                self.assertTrue(expected)
+                self.assertEqual(dict(hits), expected)
+
+    def test_collide_any_matches_spritecollideany(self):
+        aliens = moved_fleet()
+        group = pygame.sprite.Group(list(alien_sprites(aliens)))
+        probe = pygame.sprite.Sprite()
+        for rect in random_rects(aliens, 2000, 0):
+            probe.rect = rect
+            expected = pygame.sprite.spritecollideany(probe, group) is not None
+            self.assertEqual(aliens.collide_any(rect), expected, rect)
@@ -0,0 +1,47 @@
+"""
+Check that recordings hold every action the settings can fire.
+"""
+import os
+import tempfile
+import unittest
+
+from replay import Recorder, Replay, encode_actions, action_table
+from settings import Settings
+from simulation import Simulation, MOVE_RIGHT, PLAY
+
+
+def settings_with_laser():
+    """Return Settings with an extra projectile kind fired by its own action"""
+    settings = Settings()
+    settings.projectile_kinds = dict(settings.projectile_kinds, laser=dict(
+        settings.projectile_kinds['bullet'], action='fire_laser', inventory=5,
+    ))
+    settings.initialize_dynamic_settings()
+    return settings
+
+
+class ReplayTest(unittest.TestCase):
+    """A recorded session replays to the state it was recorded in"""
+
+    def test_new_projectile_kind_is_recorded(self):
+        settings = settings_with_laser()
+        sim = Simulation(settings)
+        path = os.path.join(tempfile.mkdtemp(), 'session.rec')
+        recorder = Recorder(path, 0, settings)
+        steps = [{PLAY}] + [
+            {MOVE_RIGHT, 'fire_laser'} if frame % 10 == 0 else {MOVE_RIGHT}
+            for frame in range(300)
+        ]
+        for actions in steps:
+            recorder.record(actions, 1.0)
+            sim.step(actions)
+        recorder.close(sim)
+        self.assertGreater(sim.stats.shots_fired, 0)
+
+        replay = Replay(path)
+        self.assertEqual([actions for actions, _ in replay.steps], steps)
+        self.assertTrue(replay.verify(replay.run_headless(settings_with_laser())))
+
+    def test_unknown_action_is_refused(self):
+        with self.assertRaises(ValueError):
+            encode_actions({'teleport'}, action_table(Settings()))
@@ -0,0 +1,112 @@
+import hashlib
+import os
+import weakref
+
+import pygame
+
+from assets import load_image
+
+
+class Viewport:
+    """A class to fit the logical playfield onto the display, sprites pre-scaled"""
+
+    def __init__(self, ai_game):
+        """
+        Work out the scale and letterbox offset for the display
+        :param ai_game: The game, once its display mode is set
+        :return: None
+        """
+        self.settings = ai_game.settings
+        self.assets = ai_game.assets
+        # The game is played in logical pixels, the size of the screen settings
+        self.rect = pygame.Rect(0, 0, self.settings.screen_width, self.settings.screen_height)
+        self.output_size = ai_game.screen.get_size()
+
+        # Scale the playfield as large as fits, and center it
+        self.scale = min(self.output_size[0] / self.rect.width,
+                         self.output_size[1] / self.rect.height)
+        self.offset = (
+            (self.output_size[0] - round(self.rect.width * self.scale)) // 2,
+            (self.output_size[1] - round(self.rect.height * self.scale)) // 2,
+        )
+        # A display the size of the playfield draws everything as it is
+        self.scaled = self.scale != 1.0 or self.offset != (0, 0)
+
+        # Each image at the display's scale, dropped along with the original
+        self.images = weakref.WeakKeyDictionary()
+
+    def image(self, image):
+        """Return image at the display's scale, scaling it on first use"""
+        if not self.scaled:
+            return image
+        scaled = self.images.get(image)
+        if scaled is None:
+            scaled = self.images[image] = pygame.transform.smoothscale(
+                image, self._scaled_size(image.get_size())
+            )
+        return scaled
+
+    def position(self, position):
+        """Return where a logical point is on the display"""
+        if not self.scaled:
+            return position
+        x, y = position[:2]
+        return (self.offset[0] + int(x * self.scale),
+                self.offset[1] + int(y * self.scale))
+
+    def to_logical(self, position):
+        """Return the logical point under a point on the display, e.g. the mouse"""
+        if not self.scaled:
+            return position
+        x, y = position
+        return (int((x - self.offset[0]) / self.scale),
+                int((y - self.offset[1]) / self.scale))
+
+    def items(self, items):
+        """
+        Return (image, position) pairs moved and scaled onto the display
+        :param items: (image, position) pairs in logical pixels, where a
+            position may be a Rect
+        :return: list of (image, position) pairs
+        """
+        if not self.scaled:
+            return items if isinstance(items, list) else list(items)
+        image = self.image
+        position = self.position
+        return [(image(item_image), position(item_position))
+                for item_image, item_position in items]
+
+    def forget(self, images):
+        """Drop the scaled copies of images that were redrawn in place"""
+        for changed in images:
+            self.images.pop(changed, None)
+
+    def prescale(self):
+        """
+        Scale every cached sprite image once, so none is scaled mid game.
+        With settings.scale_cache_dir set, scaled images are kept there and
+        later runs at the same display size load them instead.
+        """
+        if not self.scaled:
+            return
+        cache_dir = self.settings.scale_cache_dir
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        for key, image in list(self.assets.images.items()):
+            # Backdrops are scaled to the display when they're baked
+            if image in self.images or image.get_width() >= self.rect.width:
+                continue
+            if not cache_dir:
+                self.image(image)
+                continue
+            size = self._scaled_size(image.get_size())
+            name = hashlib.md5(repr((key, image.get_size(), size)).encode()).hexdigest()
+            path = os.path.join(cache_dir, name + '.png')
+            if os.path.exists(path):
+                self.images[image] = load_image(path)
+            else:
+                pygame.image.save(self.image(image), path)
+
+    def _scaled_size(self, size):
+        """Return the display size of something size logical pixels big"""
+        return (max(1, round(size[0] * self.scale)), max(1, round(size[1] * self.scale)))